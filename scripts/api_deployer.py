@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+HTTP API デプロイスクリプト
+
+ブラウザを使わず、設定ファイルで指定したHTTPエンドポイントに対して
+カスタムGPTの作成・更新を行う GPTDeployer のバックエンドです。
+requests.Session のコネクションプールを使い回すため、
+with ブロック内で複数のGPTを続けてデプロイすると接続確立のコストを省けます。
+
+エンドポイント（base_url からの相対パス）:
+    GET    /gpts?name=<名前>          GPTの検索
+    POST   /gpts                      GPTの作成
+    PUT    /gpts/<id>                 GPTの更新
+    GET    /gpts/<id>/files           ナレッジファイルの一覧（id, filename, sha256）
+    POST   /gpts/<id>/files           ナレッジファイルのアップロード（multipart）
+    DELETE /gpts/<id>/files/<file_id> ナレッジファイルの削除
+    PUT    /gpts/<id>/actions         Actionの設定
+    POST   /gpts/<id>/publish         保存・公開
+
+ローカル検証用のスタブサーバーは scripts/api_stub_server.py にあります。
+"""
+
+import hashlib
+import os
+from typing import Dict, List, Optional
+
+from scripts.deployer_base import GPTDeployer
+
+
+# GPT作成・更新時に送信する項目
+GPT_FIELDS = ("name", "description", "instructions", "conversation_starters", "capabilities")
+
+
+class APIDeployer(GPTDeployer):
+    """HTTP API 経由のカスタムGPTデプロイクラス"""
+
+    def __init__(self, config_path: str = "config/deploy_config.yaml",
+                 environment: Optional[str] = None,
+                 build_config_path: Optional[str] = "config/build_config.yaml"):
+        super().__init__(config_path, environment, build_config_path)
+        api_config = self.config.get('api', {})
+        self.base_url = api_config.get('base_url', 'http://localhost:8080').rstrip('/')
+        self.timeout = api_config.get('timeout', 30)
+        self.session = None
+        self.gpt_id: Optional[str] = None
+
+    def _open(self) -> bool:
+        """コネクションプール付きのHTTPセッションを作成"""
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        api_config = self.config.get('api', {})
+        automation_config = self.config.get('automation', {})
+        pool_size = api_config.get('pool_size', 10)
+
+        # 接続エラー・5xx はリトライ（POSTの二重実行を避けるため冪等なメソッドのみ）
+        retry = Retry(
+            total=automation_config.get('retry_count', 3),
+            backoff_factor=automation_config.get('retry_delay', 5) / 10,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET", "PUT", "DELETE"}),
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Accept"] = "application/json"
+        if api_config.get('token'):
+            self.session.headers["Authorization"] = f"Bearer {api_config['token']}"
+
+        self.logger.info(f"APIセッション開始: {self.base_url}")
+        return True
+
+    def _close(self):
+        """HTTPセッションを終了"""
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+        self.gpt_id = None
+
+    def _request(self, method: str, path: str, **kwargs):
+        """APIリクエストを送信（HTTPエラーは例外として送出）"""
+        response = self.session.request(method, f"{self.base_url}{path}", timeout=self.timeout, **kwargs)
+        response.raise_for_status()
+        return response.json() if response.content else {}
+
+    def _gpt_payload(self, gpt_config: Dict) -> Dict:
+        """GPT作成・更新用のリクエストボディ"""
+        return {field: gpt_config[field] for field in GPT_FIELDS if field in gpt_config}
+
+    def find_gpt(self, gpt_name: str) -> Optional[str]:
+        """名前でGPTを検索してIDを返す"""
+        for gpt in self._request("GET", "/gpts", params={"name": gpt_name}):
+            if gpt.get("name") == gpt_name:
+                return gpt["id"]
+        return None
+
+    def create(self, gpt_config: Dict) -> bool:
+        """新規GPTを作成"""
+        try:
+            self.logger.info(f"カスタムGPT作成開始: {gpt_config['name']}")
+            self.gpt_id = self._request("POST", "/gpts", json=self._gpt_payload(gpt_config))["id"]
+            self.logger.info(f"カスタムGPT作成完了: {self.gpt_id}")
+            return True
+        except Exception as e:
+            self.logger.error(f"カスタムGPT作成エラー: {e}")
+            return False
+
+    def update(self, gpt_name: str, gpt_config: Dict) -> bool:
+        """既存GPTを更新"""
+        try:
+            self.gpt_id = self.find_gpt(gpt_name)
+            if self.gpt_id is None:
+                self.logger.error(f"更新対象のGPTが見つかりません: {gpt_name}")
+                return False
+
+            self._request("PUT", f"/gpts/{self.gpt_id}", json=self._gpt_payload(gpt_config))
+            self.logger.info(f"カスタムGPT設定更新完了: {self.gpt_id}")
+            return True
+        except Exception as e:
+            self.logger.error(f"GPT更新エラー: {e}")
+            return False
+
+    def upload_knowledge(self, files: List[str]) -> bool:
+        """ナレッジファイルをアップロード"""
+        try:
+            for file_path in self._resolve_knowledge(files):
+                if not os.path.exists(file_path):
+                    self.logger.warning(f"ファイルが見つかりません: {file_path}")
+                    continue
+
+                with open(file_path, 'rb') as f:
+                    self._request("POST", f"/gpts/{self.gpt_id}/files",
+                                  files={"file": (os.path.basename(file_path), f)})
+                self.logger.info(f"ファイルアップロード完了: {file_path}")
+
+            return True
+        except Exception as e:
+            self.logger.error(f"ナレッジファイルアップロードエラー: {e}")
+            return False
+
+    def replace_knowledge(self, files: List[str]) -> bool:
+        """
+        ナレッジファイルを置き換え
+
+        ファイル名と内容のハッシュが一致するファイルはそのまま残し、
+        それ以外の既存ファイルを削除してから差分だけをアップロードします。
+        """
+        try:
+            desired = {}
+            for file_path in self._resolve_knowledge(files):
+                if not os.path.exists(file_path):
+                    self.logger.warning(f"ファイルが見つかりません: {file_path}")
+                    continue
+                with open(file_path, 'rb') as f:
+                    desired[(os.path.basename(file_path), hashlib.sha256(f.read()).hexdigest())] = file_path
+
+            kept = set()
+            for existing in self._request("GET", f"/gpts/{self.gpt_id}/files"):
+                key = (existing["filename"], existing["sha256"])
+                if key in desired and key not in kept:
+                    kept.add(key)
+                    continue
+                self._request("DELETE", f"/gpts/{self.gpt_id}/files/{existing['id']}")
+                self.logger.info(f"ファイル削除完了: {existing['filename']}")
+
+            return self.upload_knowledge([path for key, path in desired.items() if key not in kept])
+        except Exception as e:
+            self.logger.error(f"ナレッジファイル置き換えエラー: {e}")
+            return False
+
+    def set_actions(self, actions: List[Dict]) -> bool:
+        """Actionをまとめて置き換え（空のリストで全削除）"""
+        try:
+            self._request("PUT", f"/gpts/{self.gpt_id}/actions", json={"actions": actions})
+            self.logger.info(f"Action設定完了: {len(actions)} 件")
+            return True
+        except Exception as e:
+            self.logger.error(f"Action設定エラー: {e}")
+            return False
+
+    def publish(self, visibility: str = "private") -> bool:
+        """GPTを保存・公開"""
+        try:
+            self._request("POST", f"/gpts/{self.gpt_id}/publish", json={"visibility": visibility})
+            self.logger.info(f"GPT保存・公開完了 (可視性: {visibility})")
+            return True
+        except Exception as e:
+            self.logger.error(f"保存・公開エラー: {e}")
+            return False
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+API デプロイ用スタブサーバー
+
+APIDeployer が使うエンドポイントをメモリ上で模擬する検証用サーバーです。
+標準ライブラリのみで動作します。
+
+    python scripts/api_stub_server.py --port 8080
+
+テストからは StubAPIServer をスレッドで起動して使えます。
+
+    with StubAPIServer() as server:
+        ...  # api.base_url に server.base_url を指定してデプロイ
+        server.gpts  # 作成されたGPTの内容（files は id / filename / sha256 の一覧）
+        server.connections  # リクエストを受けたクライアント（ホスト, ポート）の集合
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Set, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """スタブAPIのリクエストハンドラ"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive（コネクション再利用の確認用）
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body=None):
+        data = b"" if body is None else json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self) -> Dict:
+        return json.loads(self.body or b"{}")
+
+    def _read_files(self) -> List[Tuple[str, bytes]]:
+        """multipart/form-data のファイル名と内容を取り出す"""
+        header = f"Content-Type: {self.headers.get('Content-Type', '')}\r\n\r\n".encode("utf-8")
+        message = BytesParser(policy=HTTP).parsebytes(header + self.body)
+        return [(part.get_filename(), part.get_payload(decode=True) or b"")
+                for part in message.iter_parts() if part.get_filename()]
+
+    def _route(self, method: str):
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        store = self.server.stub
+        store.requests.append((method, url.path))
+        store.connections.add(self.client_address)
+
+        # keep-alive 接続を壊さないよう、応答内容に関わらず本文は先に読み切る
+        self.body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        token = store.token
+        if token and self.headers.get("Authorization") != f"Bearer {token}":
+            return self._send(401, {"error": "unauthorized"})
+
+        if parts[:1] != ["gpts"]:
+            return self._send(404, {"error": "not found"})
+
+        if len(parts) == 1 and method == "GET":
+            name = parse_qs(url.query).get("name", [None])[0]
+            gpts = [{"id": gpt_id, "name": gpt["name"]} for gpt_id, gpt in store.gpts.items()
+                    if name is None or gpt.get("name") == name]
+            return self._send(200, gpts)
+
+        if len(parts) == 1 and method == "POST":
+            with store.lock:
+                gpt_id = f"g-{len(store.gpts) + 1}"
+                store.gpts[gpt_id] = dict(self._read_json(), files=[], actions=[], visibility=None)
+            return self._send(201, {"id": gpt_id})
+
+        gpt = store.gpts.get(parts[1])
+        if gpt is None:
+            return self._send(404, {"error": "gpt not found"})
+
+        if len(parts) == 2 and method == "PUT":
+            gpt.update(self._read_json())
+            return self._send(200, {"id": parts[1]})
+
+        if parts[2:] == ["files"] and method == "GET":
+            return self._send(200, gpt["files"])
+
+        if parts[2:] == ["files"] and method == "POST":
+            uploaded = []
+            with store.lock:
+                for filename, content in self._read_files():
+                    store.file_count += 1
+                    uploaded.append({"id": f"file-{store.file_count}", "filename": filename,
+                                     "sha256": hashlib.sha256(content).hexdigest()})
+                gpt["files"].extend(uploaded)
+            return self._send(201, uploaded)
+
+        if parts[2:3] == ["files"] and len(parts) == 4 and method == "DELETE":
+            remaining = [file for file in gpt["files"] if file["id"] != parts[3]]
+            if len(remaining) == len(gpt["files"]):
+                return self._send(404, {"error": "file not found"})
+            gpt["files"] = remaining
+            return self._send(204)
+
+        if parts[2:] == ["actions"] and method == "PUT":
+            gpt["actions"] = self._read_json().get("actions", [])
+            return self._send(200, {"count": len(gpt["actions"])})
+
+        if parts[2:] == ["publish"] and method == "POST":
+            gpt["visibility"] = self._read_json().get("visibility", "private")
+            return self._send(200, {"visibility": gpt["visibility"]})
+
+        return self._send(404, {"error": "not found"})
+
+    def do_GET(self):
+        self._route("GET")
+
+    def do_POST(self):
+        self._route("POST")
+
+    def do_PUT(self):
+        self._route("PUT")
+
+    def do_DELETE(self):
+        self._route("DELETE")
+
+
+class StubAPIServer:
+    """インメモリのスタブAPIサーバー"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, token: str = ""):
+        self.gpts: Dict[str, Dict] = {}
+        self.requests: List = []
+        self.connections: Set[Tuple[str, int]] = set()
+        self.file_count = 0
+        self.token = token
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), _StubHandler)
+        self.httpd.stub = self
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """バックグラウンドスレッドで起動"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """停止"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='APIデプロイ用スタブサーバー')
+    parser.add_argument('--host', default='127.0.0.1', help='待ち受けホスト')
+    parser.add_argument('--port', type=int, default=8080, help='待ち受けポート')
+    parser.add_argument('--token', default='', help='要求するBearerトークン（空の場合は認証なし）')
+
+    args = parser.parse_args()
+
+    server = StubAPIServer(args.host, args.port, args.token)
+    print(f"スタブAPIサーバー起動: {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+ビルド成果物ストア
+
+ビルド結果をコンテンツアドレス方式（SHA-256）で保存します。
+
+    artifacts/
+    ├── objects/ab/cdef...   # マニフェスト・ナレッジファイル本体（内容のハッシュで1回だけ保存）
+    ├── checkout/<hash>/     # ロールバック用に展開したビルド
+    └── index.json           # GPT名 -> バージョン順のハッシュ一覧、デプロイ済みハッシュ
+
+マニフェストは gpt_config.json とナレッジファイルのハッシュを含むため、
+同じ入力からのビルドは同じハッシュになり、重複して保存されません。
+バージョンは index.json のリスト位置で表すため、任意バージョンへの
+ロールバックはリスト参照とデプロイだけで済み、再ビルドは不要です。
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class ArtifactError(Exception):
+    """成果物ストアの操作エラー"""
+
+
+def canonical_json(data) -> bytes:
+    """ハッシュ計算用の正規化JSON"""
+    return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def _atomic_write(path: Path, data: bytes):
+    """一時ファイル経由で書き込み（途中で中断されても壊れたファイルを残さない）"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class ArtifactStore:
+    """コンテンツアドレス方式のビルド成果物ストア"""
+
+    def __init__(self, root="artifacts"):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.index_path = self.root / "index.json"
+        self._index: Optional[Dict] = None
+
+    # --- オブジェクト ---
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def put_object(self, data: bytes) -> str:
+        """バイト列を保存してハッシュを返す（既存の場合は書き込まない）"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            _atomic_write(path, data)
+        return digest
+
+    def get_object(self, digest: str) -> bytes:
+        """ハッシュからバイト列を取得"""
+        try:
+            return self._object_path(digest).read_bytes()
+        except FileNotFoundError:
+            raise ArtifactError(f"成果物が見つかりません: {digest}") from None
+
+    # --- インデックス ---
+
+    @property
+    def index(self) -> Dict:
+        if self._index is None:
+            if self.index_path.exists():
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+            else:
+                self._index = {}
+            self._index.setdefault("gpts", {})
+            self._index.setdefault("deployed", {})
+        return self._index
+
+    def _save_index(self):
+        _atomic_write(self.index_path, json.dumps(self.index, ensure_ascii=False, indent=2).encode("utf-8"))
+
+    def versions(self, gpt_name: str) -> List[str]:
+        """GPTのバージョン順ハッシュ一覧（バージョン1が先頭）"""
+        return list(self.index["gpts"].get(gpt_name, []))
+
+    def resolve(self, gpt_name: str, version: Optional[int] = None) -> str:
+        """
+        GPT名とバージョンからハッシュを取得
+
+        Args:
+            version: 1始まりのバージョン番号（省略時は最新、負数は最新からの相対。0 は不可）
+        """
+        hashes = self.index["gpts"].get(gpt_name)
+        if not hashes:
+            raise ArtifactError(f"GPTのビルドが登録されていません: {gpt_name}")
+
+        if version is None:
+            return hashes[-1]
+        if version == 0:
+            # 0 を最新として扱うと rollback --version 0 が黙って現行版を再デプロイするため
+            raise ArtifactError("バージョンは1以上、または最新からの相対指定（-1 で1つ前）で指定してください")
+
+        position = version - 1 if version > 0 else len(hashes) + version - 1
+        if not 0 <= position < len(hashes):
+            raise ArtifactError(f"バージョンが存在しません: {gpt_name} v{version} (1〜{len(hashes)})")
+        return hashes[position]
+
+    # --- ビルド ---
+
+    def put_build(self, gpt_config: Dict, base_dir=None) -> Dict:
+        """
+        ビルド結果を保存し、インデックスに登録
+
+        Args:
+            base_dir: 相対パスのナレッジファイルの基準ディレクトリ（省略時はカレント）
+
+        Returns:
+            {"hash": マニフェストのハッシュ, "version": バージョン番号, "new": 新規バージョンか}
+        """
+        knowledge = {}
+        for file_path in gpt_config.get("knowledge_files", []):
+            try:
+                knowledge[file_path] = self.put_object((Path(base_dir or ".") / file_path).read_bytes())
+            except FileNotFoundError:
+                raise ArtifactError(f"ナレッジファイルが見つかりません: {file_path}") from None
+
+        manifest = {"gpt_config": gpt_config, "knowledge": knowledge}
+        digest = self.put_object(canonical_json(manifest))
+
+        # 直前のバージョンと同一内容であれば新しいバージョンは作らない
+        hashes = self.index["gpts"].setdefault(gpt_config["name"], [])
+        is_new = not hashes or hashes[-1] != digest
+        if is_new:
+            hashes.append(digest)
+            self._save_index()
+
+        return {"hash": digest, "version": len(hashes), "new": is_new}
+
+    def get_build(self, digest: str) -> Dict:
+        """ハッシュからマニフェストを取得"""
+        return json.loads(self.get_object(digest))
+
+    def checkout(self, digest: str) -> Path:
+        """
+        ビルドをデプロイ可能な形で展開
+
+        ナレッジファイルは保存時の内容で checkout/<hash>/knowledge/ に復元され、
+        gpt_config.json の参照先も書き換えられます。
+
+        Returns:
+            展開した gpt_config.json のパス
+        """
+        manifest = self.get_build(digest)
+        checkout_dir = self.root / "checkout" / digest
+        config_path = checkout_dir / "gpt_config.json"
+        if config_path.exists():
+            return config_path
+
+        gpt_config = dict(manifest["gpt_config"])
+        knowledge_files = []
+        for file_path in gpt_config.get("knowledge_files", []):
+            # アップロード時のファイル名を保つため元のファイル名で復元
+            restored = checkout_dir / "knowledge" / manifest["knowledge"][file_path][:12] / Path(file_path).name
+            _atomic_write(restored, self.get_object(manifest["knowledge"][file_path]))
+            knowledge_files.append(str(restored))
+        gpt_config["knowledge_files"] = knowledge_files
+
+        _atomic_write(config_path, json.dumps(gpt_config, ensure_ascii=False, indent=2).encode("utf-8"))
+        return config_path
+
+    # --- デプロイ記録 ---
+
+    def deployed(self, gpt_name: str) -> Optional[str]:
+        """デプロイ先のGPT名に最後にデプロイしたハッシュ"""
+        return self.index["deployed"].get(gpt_name)
+
+    def record_deployment(self, gpt_name: str, digest: str):
+        """デプロイしたハッシュを記録"""
+        self.index["deployed"][gpt_name] = digest
+        self._save_index()
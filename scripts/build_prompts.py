@@ -7,29 +7,131 @@
 """
 
 import os
+import sys
+import re
 import json
-import yaml
+import hashlib
 import argparse
-from typing import Dict, List
+import itertools
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Union
 from pathlib import Path
 import logging
 
+# scripts/ から直接実行された場合も scripts.* で読み込めるようにする
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.artifact_store import ArtifactStore
+from scripts.config_loader import ConfigError, artifact_dir, load_build_config
+
+# 指示文の推奨文字数
+MIN_INSTRUCTIONS_LENGTH = 100
+MAX_INSTRUCTIONS_LENGTH = 8000
+
+# 会話スターターの上限
+MAX_CONVERSATION_STARTERS = 4
+
+# ナレッジとして収集する拡張子
+KNOWLEDGE_SUFFIXES = ('.pdf', '.txt', '.md', '.docx')
+
+# ビルド出力ファイル（再現性チェックの比較対象）
+BUILD_OUTPUTS = ("main_prompt.txt", "gpt_config.json", "build_info.json")
+
+# バリアントマトリクスで差し替え可能なコンポーネント（この順にバリアントIDを組み立てる）
+VARIANT_AXES = ("role_definition", "instructions", "examples")
+
+# バリアント名（build/variants/ 配下のディレクトリ名になるため、英数字・"_"・"-" のみ）
+VARIANT_NAME_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9_-]*")
+
+
+def canonical_dumps(data) -> str:
+    """出力用の正規化JSON（キー順固定・末尾改行あり）"""
+    return json.dumps(data, ensure_ascii=False, indent=2, sort_keys=True) + "\n"
+
+
+def write_text(path: Path, text: str):
+    """OSに依存せずLF改行・UTF-8で書き出す"""
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(text)
+
+
+def compare_builds(dir_a, dir_b) -> List[str]:
+    """2つのビルドディレクトリの出力をバイト単位で比較（差分の一覧を返す）"""
+    differences = []
+    for name in BUILD_OUTPUTS:
+        path_a, path_b = Path(dir_a) / name, Path(dir_b) / name
+        if not path_a.exists() or not path_b.exists():
+            differences.append(f"{name}: 片方のビルドに存在しません")
+        elif path_a.read_bytes() != path_b.read_bytes():
+            differences.append(f"{name}: 内容が一致しません")
+    return differences
+
+
+def validate_gpt_config(gpt_config: Dict) -> List[str]:
+    """GPT設定の検証（問題点の一覧を返す）"""
+    if not isinstance(gpt_config, dict):
+        return ["GPT設定のトップレベルはオブジェクトである必要があります"]
+        
+    issues = []
+    
+    # 必須項目チェック
+    if not gpt_config.get("name"):
+        issues.append("GPT名が設定されていません")
+    elif not isinstance(gpt_config["name"], str):
+        issues.append("GPT名は文字列である必要があります")
+        
+    instructions = gpt_config.get("instructions", "")
+    if not isinstance(instructions, str):
+        issues.append("指示文は文字列である必要があります")
+    elif not instructions:
+        issues.append("指示文が空です")
+        
+    if isinstance(instructions, str) and len(instructions) < MIN_INSTRUCTIONS_LENGTH:
+        issues.append(f"指示文が短すぎます（{MIN_INSTRUCTIONS_LENGTH}文字以上推奨）")
+        
+    if isinstance(instructions, str) and len(instructions) > MAX_INSTRUCTIONS_LENGTH:
+        issues.append(f"指示文が長すぎます（{MAX_INSTRUCTIONS_LENGTH}文字以下推奨）")
+        
+    # 会話スターターチェック
+    starters = gpt_config.get("conversation_starters", [])
+    if not isinstance(starters, list):
+        issues.append("会話スターターはリストである必要があります")
+    elif len(starters) > MAX_CONVERSATION_STARTERS:
+        issues.append(f"会話スターターが多すぎます（{MAX_CONVERSATION_STARTERS}個まで）")
+        
+    return issues
+
+
 class PromptBuilder:
     """プロンプトビルダークラス"""
     
-    def __init__(self, project_root: str = "."):
+    def __init__(self, project_root: str = ".", environment: str = None, build_dir: str = None):
         self.project_root = Path(project_root)
+        self.environment = environment
         self.src_dir = self.project_root / "src"
-        self.build_dir = self.project_root / "build"
+        self.build_dir = Path(build_dir) if build_dir else self.project_root / "build"
         self.config_dir = self.project_root / "config"
+        self._artifact_store = None
+        
+        # バリアントビルドで同じファイルを何度も読まないためのキャッシュ
+        self._component_cache: Dict[str, str] = {}
+        self._file_digest_cache: Dict[str, bytes] = {}
         
         # ディレクトリが存在しない場合は作成
-        self.build_dir.mkdir(exist_ok=True)
+        self.build_dir.mkdir(parents=True, exist_ok=True)
         
         # ログ設定
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
         
+    @property
+    def artifact_store(self) -> ArtifactStore:
+        """成果物ストア（デプロイ設定の artifacts.dir、デプロイ・ロールバックと共通）"""
+        if self._artifact_store is None:
+            self._artifact_store = ArtifactStore(artifact_dir(self.project_root, self.environment))
+        return self._artifact_store
+        
     def load_build_config(self) -> Dict:
         """ビルド設定を読み込み"""
         config_path = self.config_dir / "build_config.yaml"
@@ -59,28 +161,35 @@ class PromptBuilder:
                 ]
             }
             
+            import yaml
+            
             with open(config_path, 'w', encoding='utf-8') as f:
                 yaml.dump(default_config, f, default_flow_style=False, allow_unicode=True)
                 
             self.logger.info(f"デフォルト設定ファイルを作成しました: {config_path}")
             
-        with open(config_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+        return load_build_config(config_path, self.environment)
             
     def load_component(self, component_path: str) -> str:
-        """コンポーネントファイルを読み込み"""
+        """コンポーネントファイルを読み込み（同じパスは2回目以降メモリから返す）"""
+        if component_path in self._component_cache:
+            return self._component_cache[component_path]
+            
         file_path = self.project_root / component_path
         
         if not file_path.exists():
             self.logger.warning(f"コンポーネントファイルが見つかりません: {file_path}")
-            return ""
-            
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read().strip()
-        except Exception as e:
-            self.logger.error(f"ファイル読み込みエラー: {file_path} - {e}")
-            return ""
+            component = ""
+        else:
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    component = f.read().strip()
+            except Exception as e:
+                self.logger.error(f"ファイル読み込みエラー: {file_path} - {e}")
+                component = ""
+                
+        self._component_cache[component_path] = component
+        return component
             
     def load_directory_components(self, dir_path: str) -> List[str]:
         """ディレクトリ内の全コンポーネントを読み込み"""
@@ -90,34 +199,48 @@ class PromptBuilder:
             self.logger.warning(f"ディレクトリが見つかりません: {directory}")
             return []
             
+        # ファイルシステムに依存しないよう名前順で読み込む（例の番号を固定）
+        # Path同士の比較はWindowsでは大文字小文字を区別しないため、文字列で並べる
         components = []
-        for file_path in directory.glob("*.md"):
-            component = self.load_component(str(file_path.relative_to(self.project_root)))
+        for file_path in sorted(directory.glob("*.md"), key=lambda p: p.name):
+            component = self.load_component(self._project_path(file_path))
             if component:
                 components.append(component)
                 
         return components
         
+    def load_examples(self, examples: Union[str, List[str]]) -> List[str]:
+        """例文を読み込み（ディレクトリ、またはファイルパスのリストで指定）"""
+        if isinstance(examples, str):
+            return self.load_directory_components(examples)
+        return [component for component in map(self.load_component, examples) if component]
+        
     def build_main_prompt(self, config: Dict) -> str:
         """メインプロンプトを構築"""
+        components = config["components"]
+        return self.compose_prompt(
+            self.load_component(components["role_definition"]),
+            self.load_component(components["instructions"]),
+            self.load_examples(components["examples"]),
+        )
+        
+    def compose_prompt(self, role_def: str, instructions: str, examples: List[str]) -> str:
+        """読み込み済みのコンポーネントからメインプロンプトを組み立て"""
         prompt_parts = []
         
         # ロール定義部分
-        role_def = self.load_component(config["components"]["role_definition"])
         if role_def:
             prompt_parts.append("# あなたの役割")
             prompt_parts.append(role_def)
             prompt_parts.append("")
             
         # 指示文部分
-        instructions = self.load_component(config["components"]["instructions"])
         if instructions:
             prompt_parts.append("# 指示・制約")
             prompt_parts.append(instructions)
             prompt_parts.append("")
             
         # 例文部分
-        examples = self.load_directory_components(config["components"]["examples"])
         if examples:
             prompt_parts.append("# 応答例")
             for i, example in enumerate(examples, 1):
@@ -144,16 +267,32 @@ class PromptBuilder:
         if not knowledge_dir.exists():
             return []
             
+        # プロジェクトルートからの相対POSIXパスで、パス順に並べる
         knowledge_files = []
         for file_path in knowledge_dir.rglob("*"):
-            if file_path.is_file() and file_path.suffix in ['.pdf', '.txt', '.md', '.docx']:
-                knowledge_files.append(str(file_path))
+            if file_path.is_file() and file_path.suffix in KNOWLEDGE_SUFFIXES:
+                knowledge_files.append(self._project_path(file_path))
                 
-        return knowledge_files
+        return sorted(knowledge_files)
+        
+    def _project_path(self, path: Path) -> str:
+        """
+        ビルド出力に書くパス
         
-    def create_gpt_config(self, config: Dict, main_prompt: str) -> Dict:
+        プロジェクトルート配下は相対POSIXパス、ルート外（共有ナレッジ等）は絶対POSIXパス。
+        ルート外のパスは環境によって変わるため、再現可能なビルドにはルート配下に置くこと。
+        """
+        absolute = Path(os.path.abspath(path))
+        try:
+            return absolute.relative_to(os.path.abspath(self.project_root)).as_posix()
+        except ValueError:
+            return absolute.as_posix()
+        
+    def create_gpt_config(self, config: Dict, main_prompt: str,
+                          knowledge_files: Optional[List[str]] = None) -> Dict:
         """GPT設定JSONを作成"""
-        knowledge_files = self.collect_knowledge_files(config)
+        if knowledge_files is None:
+            knowledge_files = self.collect_knowledge_files(config)
         
         gpt_config = {
             "name": config["gpt_name"],
@@ -162,33 +301,18 @@ class PromptBuilder:
             "conversation_starters": config.get("conversation_starters", []),
             "knowledge_files": knowledge_files,
             "capabilities": config.get("capabilities", {}),
+            "actions": config.get("actions", []),
             "visibility": config.get("visibility", "private")
         }
         
         return gpt_config
         
     def validate_build(self, gpt_config: Dict) -> bool:
-        """ビルド結果の検証"""
-        issues = []
+        """ビルド結果の検証（validate-fleet と同じルール。ActionのOpenAPIスキーマも検証）"""
+        from scripts.fleet_validator import check_gpt_config
+        
+        issues = check_gpt_config(gpt_config, str(self.project_root))
         
-        # 必須項目チェック
-        if not gpt_config.get("name"):
-            issues.append("GPT名が設定されていません")
-            
-        if not gpt_config.get("instructions"):
-            issues.append("指示文が空です")
-            
-        if len(gpt_config.get("instructions", "")) < 100:
-            issues.append("指示文が短すぎます（100文字以上推奨）")
-            
-        if len(gpt_config.get("instructions", "")) > 8000:
-            issues.append("指示文が長すぎます（8000文字以下推奨）")
-            
-        # 会話スターターチェック
-        starters = gpt_config.get("conversation_starters", [])
-        if len(starters) > 4:
-            issues.append("会話スターターが多すぎます（4個まで）")
-            
         if issues:
             self.logger.error("ビルド検証エラー:")
             for issue in issues:
@@ -198,6 +322,127 @@ class PromptBuilder:
         self.logger.info("ビルド検証完了")
         return True
         
+    def build_fingerprint(self, main_prompt_text: str, gpt_config_text: str, gpt_config: Dict) -> str:
+        """出力内容とナレッジファイルの中身から算出するビルドの指紋"""
+        digest = hashlib.sha256()
+        digest.update(hashlib.sha256(main_prompt_text.encode('utf-8')).digest())
+        digest.update(hashlib.sha256(gpt_config_text.encode('utf-8')).digest())
+        for file_path in gpt_config.get("knowledge_files", []):
+            digest.update(file_path.encode('utf-8'))
+            digest.update(self._file_digest(file_path))
+        return digest.hexdigest()
+        
+    def _file_digest(self, file_path: str) -> bytes:
+        """ナレッジファイルのハッシュ（全バリアントで共有するため1回だけ計算）"""
+        if file_path not in self._file_digest_cache:
+            self._file_digest_cache[file_path] = hashlib.sha256((self.project_root / file_path).read_bytes()).digest()
+        return self._file_digest_cache[file_path]
+        
+    def variant_matrix(self, config: Dict) -> List[Dict]:
+        """
+        variants セクションから全組み合わせを列挙
+        
+        variants に定義されていないコンポーネントは components の設定を使います。
+        
+        Returns:
+            [{"id": バリアントID, "choices": {軸: バリアント名}, "components": {軸: パス}}, ...]
+        """
+        variants = config.get("variants") or {}
+        axes = [axis for axis in VARIANT_AXES if variants.get(axis)]
+        if not axes:
+            raise ConfigError("variants にバリアントが定義されていません")
+            
+        for axis in axes:
+            for name, value in variants[axis].items():
+                # "__" はバリアントIDの区切りのため、名前には使えない
+                if not (isinstance(name, str) and VARIANT_NAME_PATTERN.fullmatch(name)) or "__" in name:
+                    raise ConfigError(
+                        f"variants.{axis} のバリアント名が不正です: {name!r}（英数字・\"_\"・\"-\" のみ、\"__\" は不可）")
+                valid = isinstance(value, str) or (
+                    axis == "examples" and isinstance(value, list) and all(isinstance(v, str) for v in value))
+                if not valid:
+                    expected = "パスまたはパスのリスト" if axis == "examples" else "パス"
+                    raise ConfigError(f"variants.{axis}.{name} は{expected}である必要があります")
+                    
+        matrix = []
+        for names in itertools.product(*(sorted(variants[axis]) for axis in axes)):
+            choices = dict(zip(axes, names))
+            components = dict(config["components"])
+            components.update({axis: variants[axis][name] for axis, name in choices.items()})
+            matrix.append({"id": "__".join(names), "choices": choices, "components": components})
+            
+        return matrix
+        
+    def build_variants(self) -> bool:
+        """
+        バリアントマトリクスの全組み合わせをビルド
+        
+        各バリアントは build/variants/<バリアントID>/ に出力され、一覧と指紋は
+        build/variants/manifest.json にまとめられます。コンポーネント・ナレッジファイルは
+        1回だけ読み込んで全バリアントで共有します。成果物ストアには登録しません。
+        """
+        from scripts.fleet_validator import check_gpt_config
+        
+        try:
+            self.logger.info("バリアントビルド開始")
+            
+            config = self.load_build_config()
+            matrix = self.variant_matrix(config)
+            knowledge_files = self.collect_knowledge_files(config)
+            variants_dir = self.build_dir / "variants"
+            
+            results = []
+            failed = []
+            for variant in matrix:
+                components = variant["components"]
+                main_prompt = self.compose_prompt(
+                    self.load_component(components["role_definition"]),
+                    self.load_component(components["instructions"]),
+                    self.load_examples(components["examples"]),
+                )
+                gpt_config = self.create_gpt_config(config, main_prompt, knowledge_files)
+                
+                issues = check_gpt_config(gpt_config, str(self.project_root))
+                if issues:
+                    self.logger.error(f"バリアント検証エラー: {variant['id']}")
+                    for issue in issues:
+                        self.logger.error(f"  - {issue}")
+                    failed.append(variant["id"])
+                    continue
+                    
+                gpt_config_text = canonical_dumps(gpt_config)
+                output_dir = variants_dir / variant["id"]
+                output_dir.mkdir(parents=True, exist_ok=True)
+                write_text(output_dir / "main_prompt.txt", main_prompt)
+                write_text(output_dir / "gpt_config.json", gpt_config_text)
+                
+                results.append({
+                    "id": variant["id"],
+                    "choices": variant["choices"],
+                    "components": {axis: components[axis] for axis in VARIANT_AXES},
+                    "prompt_length": len(main_prompt),
+                    "fingerprint": self.build_fingerprint(main_prompt, gpt_config_text, gpt_config),
+                })
+                
+            manifest = {
+                "gpt_name": config["gpt_name"],
+                "knowledge_files_count": len(knowledge_files),
+                "variants": results,
+            }
+            variants_dir.mkdir(parents=True, exist_ok=True)
+            write_text(variants_dir / "manifest.json", canonical_dumps(manifest))
+            
+            self.logger.info(f"バリアントビルド完了: {len(results)}/{len(matrix)} 件")
+            self.logger.info(f"  - 出力先: {variants_dir}")
+            return not failed
+            
+        except ConfigError as e:
+            self.logger.error(f"設定エラー: {e}")
+            return False
+        except Exception as e:
+            self.logger.error(f"ビルドエラー: {e}")
+            return False
+        
     def build(self) -> bool:
         """ビルド実行"""
         try:
@@ -216,33 +461,47 @@ class PromptBuilder:
             if not self.validate_build(gpt_config):
                 return False
                 
-            # ファイル出力
+            # ファイル出力（同じ入力からは常に同じバイト列になるよう正規化）
+            gpt_config_text = canonical_dumps(gpt_config)
+            
             # メインプロンプトをテキストファイルで出力
-            with open(self.build_dir / "main_prompt.txt", 'w', encoding='utf-8') as f:
-                f.write(main_prompt)
+            write_text(self.build_dir / "main_prompt.txt", main_prompt)
                 
             # GPT設定をJSONで出力
-            with open(self.build_dir / "gpt_config.json", 'w', encoding='utf-8') as f:
-                json.dump(gpt_config, f, ensure_ascii=False, indent=2)
+            write_text(self.build_dir / "gpt_config.json", gpt_config_text)
                 
+            # 成果物ストアに保存（同一内容のビルドは重複保存されない）
+            artifact = self.artifact_store.put_build(gpt_config, base_dir=self.project_root)
+            
             # ビルド情報を出力
+            # 実行ごとに変わる値（時刻・ストア内のバージョン番号）は含めない。
+            # 時刻が必要な場合は SOURCE_DATE_EPOCH で固定値を与える。
             build_info = {
-                "build_time": "$(date -u +%Y-%m-%dT%H:%M:%SZ)",
                 "prompt_length": len(main_prompt),
                 "knowledge_files_count": len(gpt_config.get("knowledge_files", [])),
+                "artifact_hash": artifact["hash"],
+                "fingerprint": self.build_fingerprint(main_prompt, gpt_config_text, gpt_config),
                 "config": config
             }
+            if os.environ.get("SOURCE_DATE_EPOCH"):
+                build_time = datetime.fromtimestamp(int(os.environ["SOURCE_DATE_EPOCH"]), tz=timezone.utc)
+                build_info["build_time"] = build_time.strftime("%Y-%m-%dT%H:%M:%SZ")
             
-            with open(self.build_dir / "build_info.json", 'w', encoding='utf-8') as f:
-                json.dump(build_info, f, ensure_ascii=False, indent=2)
+            write_text(self.build_dir / "build_info.json", canonical_dumps(build_info))
                 
             self.logger.info(f"ビルド完了:")
             self.logger.info(f"  - プロンプト長: {len(main_prompt)} 文字")
             self.logger.info(f"  - ナレッジファイル: {len(gpt_config.get('knowledge_files', []))} 個")
             self.logger.info(f"  - 出力先: {self.build_dir}")
+            self.logger.info(f"  - 指紋: {build_info['fingerprint']}")
+            self.logger.info(f"  - 成果物: v{artifact['version']} {artifact['hash']}"
+                             + ("" if artifact["new"] else "（前回ビルドと同一）"))
             
             return True
             
+        except ConfigError as e:
+            self.logger.error(f"設定エラー: {e}")
+            return False
         except Exception as e:
             self.logger.error(f"ビルドエラー: {e}")
             return False
@@ -252,10 +511,12 @@ def main():
     parser = argparse.ArgumentParser(description='カスタムGPTプロンプトビルダー')
     parser.add_argument('--project-root', default='.', help='プロジェクトルートディレクトリ')
     parser.add_argument('--clean', action='store_true', help='ビルド前にbuildディレクトリをクリア')
+    parser.add_argument('--env', help='適用する環境名（省略時は環境変数 GPTMAKER_ENV）')
+    parser.add_argument('--variants', action='store_true', help='variants の全組み合わせをビルド')
     
     args = parser.parse_args()
     
-    builder = PromptBuilder(args.project_root)
+    builder = PromptBuilder(args.project_root, environment=args.env)
     
     # クリーンビルドの場合
     if args.clean:
@@ -264,7 +525,7 @@ def main():
             shutil.rmtree(builder.build_dir)
             builder.build_dir.mkdir()
             
-    success = builder.build()
+    success = builder.build_variants() if args.variants else builder.build()
     exit(0 if success else 1)
 
 
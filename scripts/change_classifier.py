@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+変更分類スクリプト
+
+git の差分から変更の種類を判定し、CIで実行が必要な最小限のステージを求めます。
+
+    python scripts/change_classifier.py --base origin/main
+
+分類:
+    prompt     src/prompts, src/instructions, src/examples の変更
+    knowledge  src/knowledge の変更
+    action     build_config.yaml の actions だけの変更
+    config     config/ 配下の設定の変更
+    code       スクリプト・テスト・依存関係・ワークフロー等（全ステージを実行）
+    docs       上記以外のドキュメント（ステージ不要）
+
+複数の分類にまたがる場合は mixed（code を含む場合は code）となり、
+各ファイルに必要なステージの和集合を実行します。
+変更されたYAML/JSONファイルは1プロセス内でまとめて構文チェックします。
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# scripts/ から直接実行された場合も scripts.* で読み込めるようにする
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# CIのステージ（実行順）
+STAGES = ("lint", "unit-test", "build", "validate", "integration-test", "deploy")
+
+# GPTに反映される変更で必要なステージ
+GPT_STAGES = ("build", "validate", "deploy")
+
+PROMPT_DIRS = ("src/prompts/", "src/instructions/", "src/examples/")
+KNOWLEDGE_DIRS = ("src/knowledge/",)
+DOC_DIRS = ("docs/", "examples/")
+
+BUILD_CONFIG_PATH = "config/build_config.yaml"
+DEPLOY_CONFIG_PATH = "config/deploy_config.yaml"
+
+DATA_SUFFIXES = (".yaml", ".yml", ".json")
+
+# 構文チェックで走査しないディレクトリ
+SKIP_DIRS = {".git", "venv", ".venv", "__pycache__", "node_modules", "build", "artifacts", "logs"}
+
+
+def _git(*args: str) -> Optional[str]:
+    """gitコマンドを実行（失敗した場合はNone）"""
+    try:
+        result = subprocess.run(["git", *args], capture_output=True, text=True, encoding="utf-8")
+    except OSError:
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+
+def changed_files(base: str, head: str = "HEAD") -> Optional[List[str]]:
+    """base から head までに変更されたファイル（比較できない場合はNone）"""
+    if not base or set(base) == {"0"}:  # 新規ブランチのpushでは before が 0000...
+        return None
+    output = _git("diff", "--name-only", "--no-renames", base, head)
+    if output is None:
+        return None
+    return sorted(line for line in output.splitlines() if line)
+
+
+def changed_build_config_keys(base: str, head: str = "HEAD") -> Optional[set]:
+    """build_config.yaml のトップレベルで値が変わったキー（比較できない場合はNone）"""
+    import yaml
+
+    try:
+        old = yaml.safe_load(_git("show", f"{base}:{BUILD_CONFIG_PATH}") or "") or {}
+        new = yaml.safe_load(_git("show", f"{head}:{BUILD_CONFIG_PATH}") or "") or {}
+    except yaml.YAMLError:
+        return None
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return None
+    return {key for key in set(old) | set(new) if old.get(key) != new.get(key)}
+
+
+def classify_file(path: str, build_config_keys: Optional[set] = None) -> Tuple[str, Tuple[str, ...]]:
+    """
+    1ファイルの分類と必要なステージ
+
+    Args:
+        build_config_keys: build_config.yaml で変更されたトップレベルキー（不明な場合はNone）
+    """
+    if path.startswith(PROMPT_DIRS):
+        return "prompt", GPT_STAGES
+    if path.startswith(KNOWLEDGE_DIRS):
+        return "knowledge", GPT_STAGES
+    if path == BUILD_CONFIG_PATH:
+        if build_config_keys is not None and not build_config_keys:
+            return "docs", ()  # コメント・書式だけの変更
+        if build_config_keys == {"actions"}:
+            return "action", GPT_STAGES
+        return "config", GPT_STAGES
+    if path == DEPLOY_CONFIG_PATH:
+        # デプロイはビルド成果物を使うため build も必要
+        return "config", ("build", "deploy")
+    if path.startswith("config/"):
+        return "config", GPT_STAGES
+    if path.startswith(DOC_DIRS) or (path.endswith(".md") and not path.startswith("src/")):
+        return "docs", ()
+    return "code", STAGES
+
+
+def classify_changes(files: Optional[Iterable[str]], build_config_keys: Optional[set] = None) -> Dict:
+    """
+    変更ファイルを分類して必要なステージを求める
+
+    Args:
+        files: 変更ファイル一覧（Noneの場合は差分不明として全ステージ）
+
+    Returns:
+        {"classification": 分類, "categories": {分類: [ファイル]}, "stages": [ステージ]}
+    """
+    if files is None:
+        return {"classification": "code", "categories": {}, "stages": list(STAGES)}
+
+    categories: Dict[str, List[str]] = {}
+    stages = set()
+    for path in files:
+        category, file_stages = classify_file(path, build_config_keys)
+        categories.setdefault(category, []).append(path)
+        stages.update(file_stages)
+        if path.endswith(DATA_SUFFIXES):
+            stages.add("lint")
+
+    kinds = set(categories) - {"docs"}
+    if "code" in kinds:
+        classification = "code"
+    elif len(kinds) > 1:
+        classification = "mixed"
+    elif kinds:
+        classification = kinds.pop()
+    else:
+        classification = "docs" if categories else "none"
+
+    return {
+        "classification": classification,
+        "categories": categories,
+        "stages": [stage for stage in STAGES if stage in stages],
+    }
+
+
+def find_data_files(root=".") -> List[str]:
+    """YAML/JSONファイルを列挙（仮想環境・ビルド出力等は除く）"""
+    paths = []
+    for dir_path, dir_names, file_names in os.walk(root):
+        dir_names[:] = sorted(name for name in dir_names if name not in SKIP_DIRS)
+        paths.extend(os.path.join(dir_path, name) for name in sorted(file_names) if name.endswith(DATA_SUFFIXES))
+    return paths
+
+
+def lint_files(paths: Iterable[str]) -> List[str]:
+    """YAML/JSONファイルを1プロセス内で構文チェック（エラーの一覧を返す）"""
+    yaml = None
+    errors = []
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                if path.endswith(".json"):
+                    json.load(f)
+                else:
+                    if yaml is None:
+                        import yaml
+                    # 複数ドキュメントのYAMLも最後まで読む
+                    for _ in yaml.safe_load_all(f):
+                        pass
+        except FileNotFoundError:
+            continue  # 削除されたファイル
+        except Exception as e:
+            errors.append(f"{path}: {e}")
+    return errors
+
+
+def affected_gpts(project_root=".", environment: Optional[str] = None) -> List[str]:
+    """ビルド設定から対象のGPT名を取得"""
+    from scripts.config_loader import ConfigError, load_build_config
+
+    try:
+        return [load_build_config(Path(project_root) / BUILD_CONFIG_PATH, environment)["gpt_name"]]
+    except (ConfigError, KeyError, OSError):
+        return []
+
+
+def plan_changes(base: Optional[str], head: str = "HEAD", files: Optional[List[str]] = None,
+                 environment: Optional[str] = None) -> Dict:
+    """
+    差分を分類し、変更されたYAML/JSONを検証したレポートを作成
+
+    Args:
+        base: 比較元のコミット（files を指定した場合は不要）
+        files: 変更ファイルを直接指定する場合の一覧
+    """
+    build_config_keys = None
+    if files is None:
+        files = changed_files(base, head) if base else None
+        if files is not None and BUILD_CONFIG_PATH in files:
+            build_config_keys = changed_build_config_keys(base, head)
+
+    report = classify_changes(files, build_config_keys)
+    report["base"] = base
+    report["gpts"] = affected_gpts(environment=environment) if set(report["stages"]) & set(GPT_STAGES) else []
+
+    data_files = find_data_files() if files is None else [path for path in files if path.endswith(DATA_SUFFIXES)]
+    report["lint_errors"] = lint_files(data_files)
+    return report
+
+
+def write_github_output(report: Dict, output_path: str):
+    """GitHub Actions のステップ出力（ステージごとの true / false）を書き出す"""
+    with open(output_path, "a", encoding="utf-8") as f:
+        f.write(f"classification={report['classification']}\n")
+        f.write(f"stages={' '.join(report['stages'])}\n")
+        f.write(f"gpts={' '.join(report['gpts'])}\n")
+        for stage in STAGES:
+            f.write(f"{stage.replace('-', '_')}={'true' if stage in report['stages'] else 'false'}\n")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='変更分類ツール（CIの実行ステージ判定）')
+    parser.add_argument('--base', help='比較元のコミット（省略時・比較不能時は全ステージ）')
+    parser.add_argument('--head', default='HEAD', help='比較先のコミット')
+    parser.add_argument('--files', nargs='+', help='変更ファイルを直接指定')
+    parser.add_argument('--env', help='適用する環境名（省略時は環境変数 GPTMAKER_ENV）')
+    parser.add_argument('--github-output', action='store_true', help='$GITHUB_OUTPUT にステージの判定を書き出す')
+
+    args = parser.parse_args(argv)
+
+    report = plan_changes(args.base, args.head, args.files, args.env)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+    if args.github_output and os.environ.get("GITHUB_OUTPUT"):
+        write_github_output(report, os.environ["GITHUB_OUTPUT"])
+
+    print(f"分類: {report['classification']} / ステージ: {' '.join(report['stages']) or '(なし)'}", file=sys.stderr)
+    for error in report["lint_errors"]:
+        print(f"構文エラー: {error}", file=sys.stderr)
+    return 1 if report["lint_errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
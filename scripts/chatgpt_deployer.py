@@ -4,12 +4,13 @@ ChatGPT カスタムGPT 自動デプロイスクリプト
 
 このスクリプトはSeleniumを使用してChatGPTのWeb UIを自動操作し、
 カスタムGPTの作成・更新を自動化します。
+GPTDeployer の Selenium バックエンドです。
 """
 
 import os
+import sys
 import time
 import json
-import yaml
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -17,66 +18,85 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from typing import Dict, Optional
-import logging
+from typing import Dict, List, Optional
 
-class ChatGPTDeployer:
-    """ChatGPT カスタムGPT自動デプロイクラス"""
+# scripts/ から直接実行された場合も scripts.* で読み込めるようにする
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.deploy_profiler import DeployProfiler, profiled_step
+from scripts.deployer_base import GPTDeployer
+
+class ChatGPTDeployer(GPTDeployer):
+    """ChatGPT カスタムGPT自動デプロイクラス（Selenium バックエンド）"""
     
-    def __init__(self, config_path: str = "config/deploy_config.yaml"):
+    def __init__(self, config_path: str = "config/deploy_config.yaml",
+                 environment: Optional[str] = None,
+                 build_config_path: Optional[str] = "config/build_config.yaml"):
         """
         初期化
         
         Args:
             config_path: 設定ファイルのパス
+            environment: 適用する環境名（development, production など）
+            build_config_path: deploy_config セクションを重ねるビルド設定のパス
         """
-        self.config = self._load_config(config_path)
+        super().__init__(config_path, environment, build_config_path)
         self.driver: Optional[webdriver.Chrome] = None
         self.wait: Optional[WebDriverWait] = None
-        self._setup_logging()
+        self.profiler: Optional[DeployProfiler] = None
         
-    def _load_config(self, config_path: str) -> Dict:
-        """設定ファイルを読み込む"""
-        try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
-        except FileNotFoundError:
-            self.logger.error(f"設定ファイルが見つかりません: {config_path}")
-            raise
-            
-    def _setup_logging(self):
-        """ログ設定"""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('logs/deployment.log'),
-                logging.StreamHandler()
-            ]
-        )
-        self.logger = logging.getLogger(__name__)
+        if self.config.get('profiling', {}).get('enabled', False):
+            self.enable_profiling()
         
+    def enable_profiling(self):
+        """WebDriverコマンドの計測を有効化（遅いコマンドのみDOMを保存）"""
+        self.profiler = DeployProfiler.from_config(self.config.get('profiling', {}))
+        self.logger.info(f"プロファイリング有効: {self.profiler.output_dir} (実行ID: {self.profiler.run_id})")
+        
+    @profiled_step
     def _setup_driver(self):
         """Selenium WebDriverを設定"""
+        browser_config = self.config.get('browser', {})
         chrome_options = Options()
         
         # ヘッドレスモードの設定
-        if self.config.get('headless', False):
+        if browser_config.get('headless', False):
             chrome_options.add_argument('--headless')
             
         # その他のオプション
         chrome_options.add_argument('--no-sandbox')
         chrome_options.add_argument('--disable-dev-shm-usage')
         chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--window-size=1920,1080')
+        chrome_options.add_argument(f"--window-size={browser_config.get('window_size', '1920,1080')}")
         
         # Chromeドライバーのパス設定
-        service = Service(self.config.get('chrome_driver_path', 'chromedriver'))
+        service = Service(browser_config.get('chrome_driver_path', 'chromedriver'))
         
         self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        self.wait = WebDriverWait(self.driver, 30)
+        self.driver.set_page_load_timeout(browser_config.get('page_load_timeout', 60))
+        self.wait = WebDriverWait(self.driver, browser_config.get('wait_timeout', 30))
+        
+        if self.profiler:
+            self.profiler.attach(self.driver)
         self.logger.info("WebDriver初期化完了")
         
+    def _open(self) -> bool:
+        """ブラウザを起動してログイン"""
+        self._setup_driver()
+        return self.login()
+        
+    def _close(self):
+        """ブラウザを終了"""
+        if self.driver:
+            self.driver.quit()
+            self.driver = None
+            self.wait = None
+            
+        if self.profiler:
+            self.profiler.flush()
+            
+    @profiled_step
     def login(self) -> bool:
         """ChatGPTにログイン"""
         try:
@@ -121,6 +141,7 @@ class ChatGPTDeployer:
             self.logger.error(f"ログインエラー: {e}")
             return False
             
+    @profiled_step
     def navigate_to_gpt_builder(self) -> bool:
         """GPTビルダーページに移動"""
         try:
@@ -143,8 +164,41 @@ class ChatGPTDeployer:
             self.logger.error(f"GPTビルダー移動エラー: {e}")
             return False
             
+    def create(self, gpt_config: Dict) -> bool:
+        """GPTビルダーを開いて新規GPTを設定"""
+        if not self.navigate_to_gpt_builder():
+            return False
+        return self.create_custom_gpt(gpt_config)
+        
+    @profiled_step
+    def update(self, gpt_name: str, gpt_config: Dict) -> bool:
+        """既存GPTの編集画面を開いて設定を更新"""
+        try:
+            # マイGPTsページに移動
+            self.driver.get("https://chatgpt.com/gpts/mine")
+            time.sleep(3)
+            
+            # 既存GPTを検索して編集
+            gpt_link = self.wait.until(
+                EC.element_to_be_clickable((By.XPATH, f"//a[contains(text(), '{gpt_name}')]"))
+            )
+            gpt_link.click()
+            
+            # 編集ボタンをクリック
+            edit_button = self.wait.until(
+                EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Edit')]"))
+            )
+            edit_button.click()
+            
+        except Exception as e:
+            self.logger.error(f"GPT編集画面移動エラー: {e}")
+            return False
+            
+        return self.create_custom_gpt(gpt_config)
+        
+    @profiled_step
     def create_custom_gpt(self, gpt_config: Dict) -> bool:
-        """カスタムGPTを作成"""
+        """カスタムGPTの基本情報・会話スターター・機能を設定"""
         try:
             self.logger.info(f"カスタムGPT作成開始: {gpt_config['name']}")
             
@@ -179,17 +233,9 @@ class ChatGPTDeployer:
             if 'conversation_starters' in gpt_config:
                 self._add_conversation_starters(gpt_config['conversation_starters'])
             
-            # ナレッジファイルをアップロード
-            if 'knowledge_files' in gpt_config:
-                self._upload_knowledge_files(gpt_config['knowledge_files'])
-            
             # 機能設定
             if 'capabilities' in gpt_config:
                 self._configure_capabilities(gpt_config['capabilities'])
-            
-            # Action設定
-            if 'actions' in gpt_config:
-                self._configure_actions(gpt_config['actions'])
                 
             self.logger.info("カスタムGPT設定完了")
             return True
@@ -210,7 +256,8 @@ class ChatGPTDeployer:
             except NoSuchElementException:
                 self.logger.warning(f"会話スターター{i+1}の入力欄が見つかりません")
                 
-    def _upload_knowledge_files(self, files: list):
+    @profiled_step
+    def upload_knowledge(self, files: List[str]) -> bool:
         """ナレッジファイルをアップロード"""
         try:
             # ナレッジセクションまでスクロール
@@ -228,17 +275,45 @@ class ChatGPTDeployer:
             # ファイル選択
             file_input = self.driver.find_element(By.XPATH, "//input[@type='file']")
             
-            for file_path in files:
+            for file_path in self._resolve_knowledge(files):
                 if os.path.exists(file_path):
-                    file_input.send_keys(os.path.abspath(file_path))
+                    file_input.send_keys(file_path)
                     time.sleep(2)  # アップロード完了まで待機
                     self.logger.info(f"ファイルアップロード完了: {file_path}")
                 else:
                     self.logger.warning(f"ファイルが見つかりません: {file_path}")
                     
+            return True
+            
         except Exception as e:
             self.logger.error(f"ナレッジファイルアップロードエラー: {e}")
+            return False
             
+    @profiled_step
+    def replace_knowledge(self, files: List[str]) -> bool:
+        """既存のナレッジファイルをすべて削除してからアップロード"""
+        try:
+            knowledge_section = self.driver.find_element(
+                By.XPATH, "//h3[contains(text(), 'Knowledge')]"
+            )
+            self.driver.execute_script("arguments[0].scrollIntoView();", knowledge_section)
+
+            # 削除するたびに一覧が再描画されるため、毎回先頭の削除ボタンを探し直す
+            remove_xpath = "//h3[contains(text(), 'Knowledge')]/following::button[@aria-label='Remove file']"
+            while True:
+                remove_buttons = self.driver.find_elements(By.XPATH, remove_xpath)
+                if not remove_buttons:
+                    break
+                remove_buttons[0].click()
+                time.sleep(1)
+            self.logger.info("既存のナレッジファイルを削除しました")
+
+        except Exception as e:
+            self.logger.error(f"ナレッジファイル削除エラー: {e}")
+            return False
+
+        return not files or self.upload_knowledge(files)
+
     def _configure_capabilities(self, capabilities: Dict):
         """機能設定"""
         capability_map = {
@@ -261,8 +336,9 @@ class ChatGPTDeployer:
                 except NoSuchElementException:
                     self.logger.warning(f"機能設定が見つかりません: {capability}")
                     
-    def _configure_actions(self, actions: list):
-        """Action設定"""
+    @profiled_step
+    def set_actions(self, actions: List[Dict]) -> bool:
+        """Action設定（既存のActionはすべて削除してから作成）"""
         try:
             # Actionsセクションまでスクロール
             actions_section = self.driver.find_element(
@@ -270,6 +346,23 @@ class ChatGPTDeployer:
             )
             self.driver.execute_script("arguments[0].scrollIntoView();", actions_section)
             
+            # 削除するたびに一覧が再描画されるため、毎回先頭のActionを探し直す
+            action_xpath = "//h3[contains(text(), 'Actions')]/following::button[@aria-label='Edit action']"
+            while True:
+                existing = self.driver.find_elements(By.XPATH, action_xpath)
+                if not existing:
+                    break
+                existing[0].click()
+                delete_button = self.wait.until(
+                    EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Delete')]"))
+                )
+                delete_button.click()
+                confirm_button = self.wait.until(
+                    EC.element_to_be_clickable((By.XPATH, "//div[@role='dialog']//button[contains(text(), 'Delete')]"))
+                )
+                confirm_button.click()
+                time.sleep(2)
+            
             for action in actions:
                 self.logger.info(f"Action設定開始: {action.get('name', 'Unnamed Action')}")
                 
@@ -313,6 +406,8 @@ class ChatGPTDeployer:
                 
                 self.logger.info(f"Action設定完了: {action.get('name', 'Unnamed Action')}")
                 
+            return True
+                
         except Exception as e:
             self.logger.error(f"Action設定エラー: {e}")
             # スクリーンショットを撮影（デバッグ用）
@@ -320,8 +415,10 @@ class ChatGPTDeployer:
                 self.driver.save_screenshot(f"action_error_{int(time.time())}.png")
             except:
                 pass
+            return False
                     
-    def save_and_publish(self, visibility: str = "private") -> bool:
+    @profiled_step
+    def publish(self, visibility: str = "private") -> bool:
         """GPTを保存・公開"""
         try:
             # 保存ボタンをクリック
@@ -355,94 +452,6 @@ class ChatGPTDeployer:
         except Exception as e:
             self.logger.error(f"保存・公開エラー: {e}")
             return False
-            
-    def deploy_gpt(self, gpt_config_path: str) -> bool:
-        """GPTデプロイのメイン処理"""
-        try:
-            # GPT設定を読み込み
-            with open(gpt_config_path, 'r', encoding='utf-8') as f:
-                gpt_config = json.load(f)
-            
-            # ブラウザ起動
-            self._setup_driver()
-            
-            # ログイン
-            if not self.login():
-                return False
-                
-            # GPTビルダーに移動
-            if not self.navigate_to_gpt_builder():
-                return False
-                
-            # GPT作成
-            if not self.create_custom_gpt(gpt_config):
-                return False
-                
-            # 保存・公開
-            if not self.save_and_publish(gpt_config.get('visibility', 'private')):
-                return False
-                
-            self.logger.info("GPTデプロイ完了")
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"デプロイエラー: {e}")
-            return False
-            
-        finally:
-            if self.driver:
-                self.driver.quit()
-                
-    def update_gpt(self, gpt_name: str, gpt_config_path: str) -> bool:
-        """既存GPTの更新"""
-        try:
-            self.logger.info(f"GPT更新開始: {gpt_name}")
-            
-            # GPT設定を読み込み
-            with open(gpt_config_path, 'r', encoding='utf-8') as f:
-                gpt_config = json.load(f)
-            
-            # ブラウザ起動
-            self._setup_driver()
-            
-            # ログイン
-            if not self.login():
-                return False
-                
-            # マイGPTsページに移動
-            self.driver.get("https://chatgpt.com/gpts/mine")
-            time.sleep(3)
-            
-            # 既存GPTを検索して編集
-            gpt_link = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, f"//a[contains(text(), '{gpt_name}')]"))
-            )
-            gpt_link.click()
-            
-            # 編集ボタンをクリック
-            edit_button = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Edit')]"))
-            )
-            edit_button.click()
-            
-            # GPT設定を更新
-            if not self.create_custom_gpt(gpt_config):
-                return False
-                
-            # 保存
-            if not self.save_and_publish(gpt_config.get('visibility', 'private')):
-                return False
-                
-            self.logger.info("GPT更新完了")
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"GPT更新エラー: {e}")
-            return False
-            
-        finally:
-            if self.driver:
-                self.driver.quit()
 
 
 if __name__ == "__main__":
@@ -452,10 +461,12 @@ if __name__ == "__main__":
     parser.add_argument('--config', required=True, help='GPT設定ファイルのパス')
     parser.add_argument('--action', choices=['create', 'update'], default='create', help='実行アクション')
     parser.add_argument('--name', help='更新対象のGPT名（updateの場合必須）')
+    parser.add_argument('--deploy-config', default='config/deploy_config.yaml', help='デプロイ設定ファイルのパス')
+    parser.add_argument('--env', help='適用する環境名（省略時は環境変数 GPTMAKER_ENV）')
     
     args = parser.parse_args()
     
-    deployer = ChatGPTDeployer()
+    deployer = ChatGPTDeployer(args.deploy_config, environment=args.env)
     
     if args.action == 'create':
         success = deployer.deploy_gpt(args.config)
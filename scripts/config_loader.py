@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+設定ローダー
+
+ビルド設定・デプロイ設定を共通の仕組みで読み込みます。
+
+読み込み順（後のものが優先）:
+    1. ベース設定ファイル（例: config/deploy_config.yaml）
+    2. 追加レイヤー（例: build_config.yaml の deploy_config セクション）
+    3. environments.<環境名> ブロック
+    4. ローカル設定ファイル（例: config/deploy_config.local.yaml）
+
+文字列中の ${VAR} / ${VAR:-default} は環境変数で展開され、
+結果はスキーマで検証されます。解決済みの設定は入力内容のハッシュで
+キャッシュされるため、同一プロセス内で複数ターゲットを処理しても
+YAMLの再パースは発生しません。
+"""
+
+import copy
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class ConfigError(Exception):
+    """設定ファイルの読み込み・検証エラー"""
+
+
+# 環境変数プレースホルダー: ${VAR} または ${VAR:-default}
+_ENV_PATTERN = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)(?::-([^}]*))?\}")
+
+# 環境名を指定する環境変数
+ENVIRONMENT_VARIABLE = "GPTMAKER_ENV"
+
+# スキーマ定義: キー -> 型（複数可の場合はタプル） または ネストしたスキーマ(dict)
+# 値が list の場合は [要素の型] を表す
+_ENVIRONMENT_SCHEMA = {
+    "gpt_name_suffix": str,
+    "auto_publish": bool,
+    "backup_before_update": bool,
+}
+
+DEPLOY_SCHEMA = {
+    "backend": str,
+    "credentials": {
+        "email": str,
+        "password": str,
+    },
+    "browser": {
+        "headless": bool,
+        "window_size": str,
+        "wait_timeout": int,
+        "page_load_timeout": int,
+        "chrome_driver_path": str,
+    },
+    "automation": {
+        "retry_count": int,
+        "retry_delay": int,
+        "screenshot_on_error": bool,
+    },
+    "api": {
+        "base_url": str,
+        "token": str,
+        "timeout": int,
+        "pool_size": int,
+    },
+    "artifacts": {
+        "dir": str,
+    },
+    "profiling": {
+        "enabled": bool,
+        "output_dir": str,
+        "percentile": (int, float),
+        "min_samples": int,
+        "default_threshold_ms": (int, float),
+        "min_threshold_ms": (int, float),
+    },
+    "logging": {
+        "level": str,
+        "file": str,
+        "format": str,
+    },
+    "environment": str,
+    **_ENVIRONMENT_SCHEMA,
+}
+
+BUILD_SCHEMA = {
+    "gpt_name": str,
+    "description": str,
+    "visibility": str,
+    "components": {
+        "role_definition": str,
+        "instructions": str,
+        "examples": str,
+        "knowledge": str,
+    },
+    "capabilities": {
+        "web_browsing": bool,
+        "dalle": bool,
+        "code_interpreter": bool,
+    },
+    "conversation_starters": [str],
+    "actions": [dict],
+    # バリアント名 -> コンポーネントのパス（examples はディレクトリまたはファイルのリスト）
+    "variants": {
+        "role_definition": dict,
+        "instructions": dict,
+        "examples": dict,
+    },
+    "deploy_config": {
+        "headless": bool,
+        "wait_timeout": int,
+        "retry_count": int,
+        "chrome_driver_path": str,
+    },
+    "environment": str,
+}
+
+# build_config.yaml の deploy_config セクション -> デプロイ設定のキー対応
+BUILD_DEPLOY_KEY_MAP = {
+    "headless": ("browser", "headless"),
+    "wait_timeout": ("browser", "wait_timeout"),
+    "chrome_driver_path": ("browser", "chrome_driver_path"),
+    "retry_count": ("automation", "retry_count"),
+}
+
+# artifacts.dir を省略した場合の成果物ストア
+DEFAULT_ARTIFACT_DIR = "artifacts"
+
+# 入力ハッシュ -> 解決済み設定
+_CONFIG_CACHE: Dict[str, Dict] = {}
+
+
+def local_config_path(config_path: Path) -> Path:
+    """ローカル設定ファイルのパス（例: deploy_config.local.yaml）"""
+    return config_path.with_name(f"{config_path.stem}.local{config_path.suffix}")
+
+
+def deep_merge(base: Dict, override: Dict) -> Dict:
+    """辞書を再帰的にマージ（override側が優先）"""
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def expand_env(value, environ: Optional[Dict[str, str]] = None):
+    """文字列中の ${VAR} / ${VAR:-default} を再帰的に展開"""
+    environ = os.environ if environ is None else environ
+
+    if isinstance(value, dict):
+        return {key: expand_env(item, environ) for key, item in value.items()}
+    if isinstance(value, list):
+        return [expand_env(item, environ) for item in value]
+    if isinstance(value, str):
+        return _ENV_PATTERN.sub(
+            lambda m: environ.get(m.group(1), m.group(2) if m.group(2) is not None else ""),
+            value
+        )
+    return value
+
+
+def validate_schema(config: Dict, schema: Dict, path: str = "") -> List[str]:
+    """スキーマに対する検証（未知のキー・型不一致を列挙）"""
+    issues = []
+
+    for key, value in config.items():
+        key_path = f"{path}{key}"
+        if key not in schema:
+            issues.append(f"未知の設定キー: {key_path}")
+            continue
+
+        expected = schema[key]
+        if value is None:
+            continue
+
+        if isinstance(expected, dict):
+            if not isinstance(value, dict):
+                issues.append(f"{key_path} はマッピングである必要があります")
+            else:
+                issues.extend(validate_schema(value, expected, f"{key_path}."))
+        elif isinstance(expected, list):
+            if not isinstance(value, list):
+                issues.append(f"{key_path} はリストである必要があります")
+                continue
+            for i, item in enumerate(value):
+                if not isinstance(item, expected[0]):
+                    issues.append(f"{key_path}[{i}] は {expected[0].__name__} である必要があります")
+        else:
+            # 値が (int, float) のようなタプルの場合はいずれかの型であれば良い
+            types = expected if isinstance(expected, tuple) else (expected,)
+            # bool は int のサブクラスのため、数値項目に true/false を書いた場合も誤りとする
+            if not isinstance(value, types) or (isinstance(value, bool) and bool not in types):
+                type_names = " / ".join(t.__name__ for t in types)
+                issues.append(f"{key_path} は {type_names} である必要があります")
+
+    return issues
+
+
+def _read_text(path: Path) -> Optional[str]:
+    """ファイルを読み込む（存在しない場合はNone）"""
+    try:
+        return path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+
+
+def _parse_yaml(text: str, path: Path) -> Dict:
+    """YAMLテキストをパース"""
+    import yaml
+
+    try:
+        data = yaml.safe_load(text)
+    except yaml.YAMLError as e:
+        raise ConfigError(f"YAML構文エラー: {path} - {e}") from e
+
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise ConfigError(f"設定ファイルのトップレベルはマッピングである必要があります: {path}")
+    return data
+
+
+def _cache_key(texts: List[Optional[str]], environment: Optional[str],
+               overrides: Optional[Dict], schema: Optional[Dict]) -> str:
+    """入力内容（ファイル・環境名・参照している環境変数）からキャッシュキーを算出"""
+    digest = hashlib.sha256()
+    referenced = set()
+    for text in texts:
+        digest.update(b"\0" if text is None else text.encode("utf-8"))
+        digest.update(b"\1")
+        if text:
+            referenced.update(m.group(1) for m in _ENV_PATTERN.finditer(text))
+
+    digest.update((environment or "").encode("utf-8"))
+    digest.update(json.dumps(overrides or {}, sort_keys=True, default=str).encode("utf-8"))
+    digest.update(str(id(schema)).encode("utf-8"))
+    for name in sorted(referenced):
+        digest.update(f"{name}={os.environ.get(name, '')}".encode("utf-8"))
+
+    return digest.hexdigest()
+
+
+def load_config(config_path, environment: Optional[str] = None,
+                overrides: Optional[Dict] = None, schema: Optional[Dict] = None) -> Dict:
+    """
+    レイヤー化された設定を読み込む
+
+    Args:
+        config_path: ベース設定ファイルのパス
+        environment: 環境名（省略時は環境変数 GPTMAKER_ENV）
+        overrides: ベースと環境ブロックの間に適用する追加レイヤー
+        schema: 検証に用いるスキーマ（Noneの場合は検証しない）
+
+    Returns:
+        解決済みの設定（呼び出し側で変更しても良いコピー）
+
+    Raises:
+        ConfigError: ファイルが存在しない、または検証に失敗した場合
+    """
+    config_path = Path(config_path)
+    environment = environment or os.environ.get(ENVIRONMENT_VARIABLE) or None
+
+    base_text = _read_text(config_path)
+    if base_text is None:
+        raise ConfigError(f"設定ファイルが見つかりません: {config_path}")
+
+    local_path = local_config_path(config_path)
+    local_text = _read_text(local_path)
+
+    key = _cache_key([base_text, local_text], environment, overrides, schema)
+    if key in _CONFIG_CACHE:
+        return copy.deepcopy(_CONFIG_CACHE[key])
+
+    config = _parse_yaml(base_text, config_path)
+    local = _parse_yaml(local_text, local_path) if local_text is not None else {}
+
+    environments = deep_merge(config.pop("environments", None) or {},
+                              local.pop("environments", None) or {})
+
+    if overrides:
+        config = deep_merge(config, overrides)
+
+    if environment:
+        # 環境ブロックを持つファイルで未定義の環境名が指定された場合はエラー
+        if environments and environment not in environments:
+            raise ConfigError(f"未定義の環境です: {environment} ({config_path})")
+        config = deep_merge(config, environments.get(environment) or {})
+        config["environment"] = environment
+
+    config = expand_env(deep_merge(config, local))
+
+    if schema is not None:
+        issues = validate_schema(config, schema)
+        if issues:
+            raise ConfigError(f"設定検証エラー ({config_path}): " + "; ".join(issues))
+
+    _CONFIG_CACHE[key] = config
+    return copy.deepcopy(config)
+
+
+def build_deploy_overrides(build_config: Dict) -> Dict:
+    """build_config.yaml の deploy_config セクションをデプロイ設定の形に変換"""
+    overrides: Dict = {}
+    for key, value in (build_config.get("deploy_config") or {}).items():
+        section, name = BUILD_DEPLOY_KEY_MAP[key]
+        overrides.setdefault(section, {})[name] = value
+    return overrides
+
+
+def load_build_config(config_path="config/build_config.yaml",
+                      environment: Optional[str] = None) -> Dict:
+    """ビルド設定を読み込む"""
+    return load_config(config_path, environment, schema=BUILD_SCHEMA)
+
+
+def load_deploy_config(config_path="config/deploy_config.yaml",
+                       environment: Optional[str] = None,
+                       build_config_path=None) -> Dict:
+    """
+    デプロイ設定を読み込む
+
+    build_config_path が指定された場合、その deploy_config セクションを
+    ベース設定の上に重ねます。
+    """
+    overrides = None
+    if build_config_path is not None and Path(build_config_path).exists():
+        overrides = build_deploy_overrides(load_build_config(build_config_path, environment))
+    return load_config(config_path, environment, overrides=overrides, schema=DEPLOY_SCHEMA)
+
+
+def resolve_artifact_dir(deploy_config: Dict, project_root=".") -> Path:
+    """成果物ストアのディレクトリ（artifacts.dir、相対パスはプロジェクトルート基準）"""
+    path = Path(deploy_config.get("artifacts", {}).get("dir", DEFAULT_ARTIFACT_DIR))
+    return path if path.is_absolute() else Path(project_root) / path
+
+
+def artifact_dir(project_root=".", environment: Optional[str] = None) -> Path:
+    """
+    プロジェクトの成果物ストアのディレクトリ
+
+    ビルド・デプロイ・一覧表示で同じストアを使うため、
+    プロジェクトの config/deploy_config.yaml から解決します。
+    """
+    config_dir = Path(project_root) / "config"
+    config_path = config_dir / "deploy_config.yaml"
+    deploy_config = {}
+    if config_path.exists():
+        deploy_config = load_deploy_config(config_path, environment, config_dir / "build_config.yaml")
+    return resolve_artifact_dir(deploy_config, project_root)
+
+
+def clear_cache():
+    """設定キャッシュをクリア"""
+    _CONFIG_CACHE.clear()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+デプロイ処理プロファイラー
+
+ChatGPTDeployer が発行する全ての WebDriver コマンドの所要時間を計測します。
+過去の実行を含めた同一コマンドの所要時間のパーセンタイルを超えたものを
+「遅いコマンド」として記録し、その時点のDOMスナップショットだけを保存します。
+
+    logs/profiles/
+    ├── profile.jsonl        # 全実行の計測結果（1行1レコード）
+    ├── snapshots/*.html     # 遅いコマンド直後のDOM
+    └── report.html          # generate_report で生成するHTMLレポート
+
+    python scripts/deploy_profiler.py --output-dir logs/profiles
+"""
+
+import argparse
+import functools
+import html
+import json
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """パーセンタイル値（線形補間）"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def profiled_step(method):
+    """デプロイヤーのメソッドを1つのステップとして計測するデコレーター"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        profiler = getattr(self, "profiler", None)
+        if profiler is None:
+            return method(self, *args, **kwargs)
+        with profiler.step(method.__name__):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class DeployProfiler:
+    """WebDriverコマンドの計測と遅いコマンドのDOM保存"""
+
+    def __init__(self, output_dir="logs/profiles", percentile: float = 95,
+                 min_samples: int = 20, default_threshold_ms: float = 2000,
+                 min_threshold_ms: float = 500):
+        """
+        Args:
+            output_dir: 計測結果・スナップショットの出力先
+            percentile: 遅いと判定するパーセンタイル
+            min_samples: パーセンタイルを使うのに必要な過去の計測数
+            default_threshold_ms: 過去の計測が足りないコマンドの閾値
+            min_threshold_ms: 閾値の下限（ばらつきの小さい高速なコマンドを遅いと判定しないため）
+        """
+        self.output_dir = Path(output_dir)
+        self.history_path = self.output_dir / "profile.jsonl"
+        self.snapshot_dir = self.output_dir / "snapshots"
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.default_threshold_ms = default_threshold_ms
+        self.min_threshold_ms = min_threshold_ms
+
+        self.run_id = time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+        self.records: List[Dict] = []
+        self.thresholds = self._load_thresholds()
+        self._steps: List[List] = []  # [ステップパス, 内部ステップの合計(ms)]
+        self._capturing = False
+        self._driver = None
+
+    @classmethod
+    def from_config(cls, profiling_config: Dict) -> "DeployProfiler":
+        """デプロイ設定の profiling セクションから生成"""
+        options = {key: value for key, value in profiling_config.items() if key != "enabled"}
+        return cls(**options)
+
+    def _load_thresholds(self) -> Dict[str, float]:
+        """過去の実行からコマンドごとの閾値を算出"""
+        durations = defaultdict(list)
+        for record in load_records(self.history_path):
+            if record.get("kind") == "command":
+                durations[record["command"]].append(record["duration_ms"])
+
+        return {command: percentile(values, self.percentile)
+                for command, values in durations.items() if len(values) >= self.min_samples}
+
+    def threshold_for(self, command: str) -> float:
+        return max(self.thresholds.get(command, self.default_threshold_ms), self.min_threshold_ms)
+
+    @property
+    def current_step(self) -> str:
+        return self._steps[-1][0] if self._steps else "-"
+
+    @contextmanager
+    def step(self, name: str):
+        """
+        ステップ（デプロイヤーのメソッド単位）の所要時間を計測
+
+        入れ子のステップは "update/create_custom_gpt" のようなパスで記録し、
+        内部ステップを除いた自己時間（self_ms）も併せて残します。
+        """
+        path = f"{self.current_step}/{name}" if self._steps else name
+        self._steps.append([path, 0.0])
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            _, child_ms = self._steps.pop()
+            if self._steps:
+                self._steps[-1][1] += duration_ms
+            self.records.append({
+                "run_id": self.run_id,
+                "kind": "step",
+                "step": path,
+                "duration_ms": round(duration_ms, 1),
+                "self_ms": round(duration_ms - child_ms, 1),
+            })
+
+    def attach(self, driver):
+        """WebDriverの全コマンド（driver.execute）を計測対象にする"""
+        original_execute = driver.execute
+        self._driver = driver
+
+        @functools.wraps(original_execute)
+        def execute(driver_command, params=None):
+            if self._capturing:
+                return original_execute(driver_command, params)
+
+            started = time.perf_counter()
+            try:
+                return original_execute(driver_command, params)
+            finally:
+                self._record_command(driver_command, (time.perf_counter() - started) * 1000)
+
+        driver.execute = execute
+        return driver
+
+    def _record_command(self, command: str, duration_ms: float):
+        record = {
+            "run_id": self.run_id,
+            "kind": "command",
+            "step": self.current_step,
+            "command": command,
+            "duration_ms": round(duration_ms, 1),
+            "slow": duration_ms > self.threshold_for(command),
+        }
+        if record["slow"] and command != "quit":
+            record["snapshot"] = self._capture_snapshot(len(self.records), command)
+        self.records.append(record)
+
+    def _capture_snapshot(self, sequence: int, command: str) -> Optional[str]:
+        """遅いコマンド直後のDOMを保存（保存に失敗しても処理は継続）"""
+        self._capturing = True
+        try:
+            source = self._driver.page_source
+            path = self.snapshot_dir / f"{self.run_id}_{sequence:04d}_{command}.html"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(source, encoding="utf-8")
+            return str(path.relative_to(self.output_dir))
+        except Exception:
+            return None
+        finally:
+            self._capturing = False
+
+    def flush(self):
+        """計測結果を履歴ファイルに追記"""
+        if not self.records:
+            return
+        self.history_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.history_path, "a", encoding="utf-8") as f:
+            for record in self.records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.records = []
+
+
+def load_records(history_path) -> List[Dict]:
+    """履歴ファイルを読み込む（存在しない場合は空）"""
+    history_path = Path(history_path)
+    if not history_path.exists():
+        return []
+    with open(history_path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _table(headers: List[str], rows: List[List[str]]) -> str:
+    head = "".join(f"<th>{html.escape(header)}</th>" for header in headers)
+    body = "".join("<tr>" + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>" for row in rows)
+    return f"<table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>"
+
+
+def generate_report(output_dir="logs/profiles", top: int = 50) -> Path:
+    """
+    全実行の計測結果からHTMLレポートを生成
+
+    Returns:
+        生成したレポートのパス
+    """
+    output_dir = Path(output_dir)
+    records = load_records(output_dir / "profile.jsonl")
+    commands = [record for record in records if record.get("kind") == "command"]
+    steps = [record for record in records if record.get("kind") == "step"]
+    runs = sorted({record["run_id"] for record in records})
+
+    # 最も遅いコマンド
+    slowest_rows = []
+    for record in sorted(commands, key=lambda r: r["duration_ms"], reverse=True)[:top]:
+        snapshot = record.get("snapshot")
+        link = f'<a href="{html.escape(snapshot)}">DOM</a>' if snapshot else ""
+        slowest_rows.append([
+            f"{record['duration_ms']:.1f}", html.escape(record["command"]), html.escape(record["step"]),
+            html.escape(record["run_id"]), "●" if record.get("slow") else "", link,
+        ])
+
+    # ステップ別の自己時間（入れ子のステップを二重に数えないデプロイ時間の内訳）
+    step_durations = defaultdict(list)
+    step_self = defaultdict(float)
+    for record in steps:
+        step_durations[record["step"]].append(record["duration_ms"])
+        step_self[record["step"]] += record.get("self_ms", record["duration_ms"])
+    step_rows = [
+        [html.escape(name), str(len(values)), f"{step_self[name] / 1000:.1f}",
+         f"{sum(values) / 1000:.1f}", f"{sum(values) / len(values):.1f}", f"{max(values):.1f}"]
+        for name, values in sorted(step_durations.items(), key=lambda item: step_self[item[0]], reverse=True)
+    ]
+
+    # コマンド別の統計
+    command_durations = defaultdict(list)
+    for record in commands:
+        command_durations[record["command"]].append(record["duration_ms"])
+    command_rows = [
+        [html.escape(name), str(len(values)), f"{sum(values) / 1000:.1f}",
+         f"{percentile(values, 50):.1f}", f"{percentile(values, 95):.1f}", f"{max(values):.1f}"]
+        for name, values in sorted(command_durations.items(), key=lambda item: sum(item[1]), reverse=True)
+    ]
+
+    report = f"""<!DOCTYPE html>
+<html lang="ja">
+<head>
+<meta charset="utf-8">
+<title>デプロイ プロファイルレポート</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+table {{ border-collapse: collapse; margin-bottom: 2em; }}
+th, td {{ border: 1px solid #ccc; padding: 4px 8px; text-align: right; }}
+th {{ background: #f0f0f0; }}
+td:nth-child(2), td:nth-child(3) {{ text-align: left; }}
+</style>
+</head>
+<body>
+<h1>デプロイ プロファイルレポート</h1>
+<p>対象実行数: {len(runs)} / 計測コマンド数: {len(commands)}</p>
+<h2>ステップ別所要時間</h2>
+{_table(["ステップ", "回数", "自己時間(秒)", "合計(秒)", "平均(ms)", "最大(ms)"], step_rows)}
+<h2>コマンド別統計</h2>
+{_table(["コマンド", "回数", "合計(秒)", "p50(ms)", "p95(ms)", "最大(ms)"], command_rows)}
+<h2>最も遅いコマンド（上位{top}件）</h2>
+{_table(["所要時間(ms)", "コマンド", "ステップ", "実行ID", "閾値超過", "スナップショット"], slowest_rows)}
+</body>
+</html>
+"""
+    report_path = output_dir / "report.html"
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(report, encoding="utf-8")
+    return report_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='デプロイ プロファイルレポート生成')
+    parser.add_argument('--output-dir', default='logs/profiles', help='計測結果のディレクトリ')
+    parser.add_argument('--top', type=int, default=50, help='表示する遅いコマンドの件数')
+
+    args = parser.parse_args()
+
+    print(f"レポート生成完了: {generate_report(args.output_dir, args.top)}")
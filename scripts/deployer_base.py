@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+デプロイヤー共通インターフェース
+
+カスタムGPTのデプロイ手段（ブラウザ自動操作・HTTP API など）を
+バックエンドとして差し替えられるようにするための基底クラスです。
+
+各バックエンドは以下の操作を実装します。
+    - _open / _close: セッションの開始・終了（ブラウザ起動とログイン等）
+    - create: 新規GPTの作成（基本情報・会話スターター・機能設定）
+    - update: 既存GPTの更新
+    - upload_knowledge: ナレッジファイルのアップロード（新規作成時）
+    - replace_knowledge: 既存GPTのナレッジファイルの置き換え（更新時）
+    - set_actions: Actionの設定（既存のActionは置き換え）
+    - publish: 保存・公開
+
+処理の順序や環境別設定の適用は deploy_gpt / update_gpt が共通で行います。
+"""
+
+import importlib
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from scripts.artifact_store import ArtifactError, ArtifactStore
+from scripts.config_loader import load_deploy_config, resolve_artifact_dir
+
+
+# バックエンド名 -> (モジュール名, クラス名)
+# 重い依存（Selenium等）を避けるため、クラスは create_deployer で遅延importする
+DEPLOYER_BACKENDS = {
+    "selenium": ("chatgpt_deployer", "ChatGPTDeployer"),
+    "api": ("api_deployer", "APIDeployer"),
+}
+
+DEFAULT_BACKEND = "selenium"
+
+
+class GPTDeployer(ABC):
+    """カスタムGPTデプロイヤーの基底クラス"""
+
+    def __init__(self, config_path: str = "config/deploy_config.yaml",
+                 environment: Optional[str] = None,
+                 build_config_path: Optional[str] = "config/build_config.yaml"):
+        """
+        初期化
+
+        Args:
+            config_path: 設定ファイルのパス
+            environment: 適用する環境名（development, production など）
+            build_config_path: deploy_config セクションを重ねるビルド設定のパス
+        """
+        self.logger = logging.getLogger(self.__class__.__module__)
+        self.config = self._load_config(config_path, environment, build_config_path)
+        self.connected = False
+        # 設定ファイルは <プロジェクトルート>/config/ にある前提で、ビルドと同じストアを使う
+        self.project_root = Path(os.path.abspath(config_path)).parent.parent
+        self.artifact_store = ArtifactStore(resolve_artifact_dir(self.config, self.project_root))
+        self._setup_logging()
+
+    def _load_config(self, config_path: str, environment: Optional[str] = None,
+                     build_config_path: Optional[str] = None) -> Dict:
+        """設定ファイルを読み込む（環境別設定・ローカル設定・環境変数を解決）"""
+        try:
+            return load_deploy_config(config_path, environment, build_config_path)
+        except Exception as e:
+            self.logger.error(f"設定ファイル読み込みエラー: {e}")
+            raise
+
+    def _setup_logging(self):
+        """ログ設定"""
+        log_config = self.config.get('logging', {})
+        log_file = Path(log_config.get('file', 'logs/deployment.log'))
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+
+        logging.basicConfig(
+            level=getattr(logging, log_config.get('level', 'INFO').upper(), logging.INFO),
+            format=log_config.get('format', '%(asctime)s - %(levelname)s - %(message)s'),
+            handlers=[
+                logging.FileHandler(log_file),
+                logging.StreamHandler()
+            ]
+        )
+
+    def _apply_environment(self, gpt_config: Dict) -> Dict:
+        """環境別設定（GPT名サフィックス・自動公開）をGPT設定に適用"""
+        gpt_config = dict(gpt_config)
+        gpt_config['name'] = gpt_config['name'] + self.config.get('gpt_name_suffix', '')
+
+        # 自動公開しない環境では常にprivateで保存
+        if not self.config.get('auto_publish', True):
+            gpt_config['visibility'] = 'private'
+
+        return gpt_config
+
+    def _load_gpt_config(self, gpt_config_path: str) -> Dict:
+        """GPT設定を読み込む"""
+        with open(gpt_config_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _resolve_knowledge(self, files: List[str]) -> List[str]:
+        """ナレッジファイルのパスを解決（ビルド出力の相対パスはプロジェクトルート基準）"""
+        return [str(self.project_root / file_path) for file_path in files]
+
+    def _store_artifact(self, gpt_config: Dict) -> Optional[str]:
+        """デプロイするGPT設定を成果物ストアに保存（ロールバック用）"""
+        try:
+            return self.artifact_store.put_build(gpt_config, self.project_root)["hash"]
+        except ArtifactError as e:
+            self.logger.warning(f"成果物ストアに保存できません（ロールバック不可）: {e}")
+            return None
+
+    def _backup_before_update(self, gpt_name: str) -> bool:
+        """
+        更新前のバージョンが成果物ストアに残っていることを確認
+
+        Returns:
+            ロールバック可能な場合True（Falseの場合は更新しない）
+        """
+        previous = self.artifact_store.deployed(gpt_name)
+        if previous:
+            try:
+                self.artifact_store.get_build(previous)
+                self.logger.info(f"更新前のバージョンを保持しています: {previous}")
+                return True
+            except ArtifactError as e:
+                self.logger.error(f"更新前のバージョンを読み込めません: {e}")
+        else:
+            self.logger.error(f"更新前のバージョンが成果物ストア（{self.artifact_store.root}）に記録されていません: {gpt_name}")
+
+        self.logger.error("backup_before_update が有効なため更新を中止しました。"
+                          "成果物ストアを復元するか、初回のみ --skip-backup-check を付けて更新してください")
+        return False
+
+    # --- セッション管理 ---
+
+    @abstractmethod
+    def _open(self) -> bool:
+        """セッションを開始（ブラウザ起動・認証など）"""
+
+    @abstractmethod
+    def _close(self):
+        """セッションを終了"""
+
+    def connect(self) -> bool:
+        """セッションを開始（接続済みの場合は何もしない）"""
+        if not self.connected:
+            self.connected = self._open()
+        return self.connected
+
+    def close(self):
+        """セッションを終了"""
+        try:
+            self._close()
+        finally:
+            self.connected = False
+
+    def __enter__(self):
+        if not self.connect():
+            raise ConnectionError("デプロイセッションを開始できませんでした")
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # --- バックエンド固有の操作 ---
+
+    @abstractmethod
+    def create(self, gpt_config: Dict) -> bool:
+        """新規GPTを作成（基本情報・会話スターター・機能設定）"""
+
+    @abstractmethod
+    def update(self, gpt_name: str, gpt_config: Dict) -> bool:
+        """既存GPTを開き、基本情報・会話スターター・機能設定を更新"""
+
+    @abstractmethod
+    def upload_knowledge(self, files: List[str]) -> bool:
+        """ナレッジファイルをアップロード"""
+
+    @abstractmethod
+    def replace_knowledge(self, files: List[str]) -> bool:
+        """既存GPTのナレッジファイルを指定のファイル一式に置き換え（重複アップロードしない）"""
+
+    @abstractmethod
+    def set_actions(self, actions: List[Dict]) -> bool:
+        """GPTのActionを指定の一覧に置き換え（空の場合は既存のActionをすべて削除）"""
+
+    @abstractmethod
+    def publish(self, visibility: str = "private") -> bool:
+        """GPTを保存・公開"""
+
+    # --- 共通のデプロイ手順 ---
+
+    def _finish(self, gpt_config: Dict, updating: bool = False) -> bool:
+        """作成・更新後の共通手順（ナレッジ・Action・公開）"""
+        knowledge_files = gpt_config.get('knowledge_files', [])
+        if updating:
+            # 既存のファイルが残っているため、追加ではなく置き換える（不要になったファイルも削除）
+            if not self.replace_knowledge(knowledge_files):
+                return False
+        elif knowledge_files and not self.upload_knowledge(knowledge_files):
+            return False
+
+        # 更新時は Action がなくても呼び出し、前のバージョンの Action を残さない
+        actions = gpt_config.get('actions', [])
+        if (updating or actions) and not self.set_actions(actions):
+            return False
+
+        return self.publish(gpt_config.get('visibility', 'private'))
+
+    def deploy_gpt(self, gpt_config_path: str) -> bool:
+        """GPTデプロイのメイン処理"""
+        # with ブロック内で呼ばれた場合はセッションを使い回す
+        owns_session = not self.connected
+        try:
+            source_config = self._load_gpt_config(gpt_config_path)
+            digest = self._store_artifact(source_config)
+            gpt_config = self._apply_environment(source_config)
+
+            if not self.connect():
+                return False
+
+            if not self.create(gpt_config):
+                return False
+
+            if not self._finish(gpt_config):
+                return False
+
+            if digest:
+                self.artifact_store.record_deployment(gpt_config['name'], digest)
+
+            self.logger.info("GPTデプロイ完了")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"デプロイエラー: {e}")
+            return False
+
+        finally:
+            if owns_session:
+                self.close()
+
+    def update_gpt(self, gpt_name: str, gpt_config_path: str) -> bool:
+        """既存GPTの更新"""
+        self.logger.info(f"GPT更新開始: {gpt_name}")
+        try:
+            source_config = self._load_gpt_config(gpt_config_path)
+        except Exception as e:
+            self.logger.error(f"GPT更新エラー: {e}")
+            return False
+
+        return self._update_from_config(gpt_name, source_config, self._store_artifact(source_config))
+
+    def rollback_gpt(self, gpt_name: str, source_name: str, version: Optional[int] = None) -> bool:
+        """
+        成果物ストアに保存済みのバージョンで既存GPTを更新（再ビルドなし）
+
+        Args:
+            gpt_name: 更新対象（デプロイ先）のGPT名
+            source_name: ビルド時のGPT名（成果物ストアのキー）
+            version: 戻すバージョン（省略時は最新、負数は最新からの相対）
+        """
+        try:
+            digest = self.artifact_store.resolve(source_name, version)
+            source_config = self._load_gpt_config(str(self.artifact_store.checkout(digest)))
+        except (ArtifactError, OSError, ValueError) as e:
+            self.logger.error(f"ロールバックエラー: {e}")
+            return False
+
+        self.logger.info(f"ロールバック開始: {gpt_name} -> {digest}")
+        return self._update_from_config(gpt_name, source_config, digest)
+
+    def _update_from_config(self, gpt_name: str, source_config: Dict, digest: Optional[str]) -> bool:
+        """GPT設定で既存GPTを更新し、成功時にデプロイ済みハッシュを記録"""
+        owns_session = not self.connected
+        try:
+            gpt_config = self._apply_environment(source_config)
+
+            if self.config.get('backup_before_update') and not self._backup_before_update(gpt_name):
+                return False
+
+            if not self.connect():
+                return False
+
+            if not self.update(gpt_name, gpt_config):
+                return False
+
+            if not self._finish(gpt_config, updating=True):
+                return False
+
+            if digest:
+                self.artifact_store.record_deployment(gpt_name, digest)
+
+            self.logger.info("GPT更新完了")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"GPT更新エラー: {e}")
+            return False
+
+        finally:
+            if owns_session:
+                self.close()
+
+
+def create_deployer(backend: Optional[str] = None,
+                    config_path: str = "config/deploy_config.yaml",
+                    environment: Optional[str] = None,
+                    build_config_path: Optional[str] = "config/build_config.yaml") -> GPTDeployer:
+    """
+    バックエンド名からデプロイヤーを生成
+
+    Args:
+        backend: バックエンド名（省略時は設定ファイルの backend、なければ selenium）
+
+    Raises:
+        ValueError: 未知のバックエンドが指定された場合
+    """
+    if backend is None:
+        backend = load_deploy_config(config_path, environment, build_config_path).get('backend', DEFAULT_BACKEND)
+
+    if backend not in DEPLOYER_BACKENDS:
+        raise ValueError(f"未知のデプロイバックエンドです: {backend} (選択肢: {', '.join(DEPLOYER_BACKENDS)})")
+
+    module_name, class_name = DEPLOYER_BACKENDS[backend]
+    module = importlib.import_module(f"scripts.{module_name}")
+
+    deployer_class = getattr(module, class_name)
+    return deployer_class(config_path, environment=environment, build_config_path=build_config_path)
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+GPT設定一括検証スクリプト
+
+globで指定した複数の gpt_config.json を並列に検証し、
+機械可読なJSONレポートを出力します。
+
+    python scripts/fleet_validator.py "gpts/**/gpt_config.json" --output report.json
+
+ナレッジファイルの相対パスは、各GPT設定を所有するプロジェクト（config/build_config.yaml を持つ
+最も近い上位ディレクトリ。build/gpt_config.json であればそのプロジェクトのルート）を基準に解決します。
+--project-root を指定した場合は全ての設定でそのディレクトリを基準にします。
+
+検証内容:
+    - GPT名・指示文の長さ・会話スターター数（build_prompts.validate_gpt_config）
+    - ナレッジファイルの存在
+    - 機能設定（capabilities）のキーと値
+    - ActionのOpenAPIスキーマの形式とAction名の重複
+
+1ファイルの検証で例外が発生しても、そのファイルのエラーとして記録して続行します。
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from typing import Dict, List, Optional
+
+# scripts/ から直接実行された場合も scripts.* で読み込めるようにする
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.build_prompts import validate_gpt_config
+from scripts.config_loader import BUILD_SCHEMA
+
+
+KNOWN_CAPABILITIES = tuple(BUILD_SCHEMA["capabilities"])
+
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+
+# この件数未満は並列化のオーバーヘッドの方が大きいため直列で検証
+PARALLEL_THRESHOLD = 64
+
+
+@lru_cache(maxsize=None)
+def _file_exists(path: str) -> bool:
+    """ナレッジファイルの存在確認（複数のGPTで共有されるファイルは1回だけ確認）"""
+    return os.path.isfile(path)
+
+
+@lru_cache(maxsize=None)
+def _find_project_root(directory: str) -> Optional[str]:
+    """config/build_config.yaml を持つ最も近い上位ディレクトリ（見つからない場合はNone）"""
+    while True:
+        if os.path.isfile(os.path.join(directory, "config", "build_config.yaml")):
+            return directory
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+def config_project_root(config_path: str) -> str:
+    """GPT設定を所有するプロジェクトのルート（見つからない場合はカレントディレクトリ）"""
+    return _find_project_root(os.path.dirname(os.path.abspath(config_path))) or "."
+
+
+def validate_action_schema(action: Dict) -> List[str]:
+    """ActionのOpenAPIスキーマの形式を検証"""
+    if not isinstance(action, dict):
+        return ["Action定義はオブジェクトである必要があります"]
+
+    issues = []
+    name = action.get("name")
+    label = name or "Unnamed Action"
+
+    if not isinstance(name, str) or not name:
+        issues.append("Action名が設定されていません")
+
+    schema = action.get("schema")
+    if not isinstance(schema, dict):
+        return issues + [f"Actionのスキーマがありません: {label}"]
+
+    if not str(schema.get("openapi", "")).startswith("3."):
+        issues.append(f"openapi バージョンが 3.x ではありません: {label}")
+
+    info = schema.get("info")
+    if not isinstance(info, dict) or not info.get("title") or not info.get("version"):
+        issues.append(f"info.title / info.version が必要です: {label}")
+
+    servers = schema.get("servers")
+    if not isinstance(servers, list) or not servers or not all(
+            isinstance(server, dict) and server.get("url") for server in servers):
+        issues.append(f"servers にURLが必要です: {label}")
+
+    paths = schema.get("paths")
+    if not isinstance(paths, dict) or not paths:
+        issues.append(f"Actionにエンドポイントがありません: {label}")
+        return issues
+
+    for path, path_item in paths.items():
+        if not path.startswith("/"):
+            issues.append(f"パスは / で始まる必要があります: {label} {path}")
+        if not isinstance(path_item, dict):
+            issues.append(f"パス定義はオブジェクトである必要があります: {label} {path}")
+            continue
+        operations = [method for method in HTTP_METHODS if method in path_item]
+        if not operations:
+            issues.append(f"パスにHTTPメソッドが定義されていません: {label} {path}")
+        for method in operations:
+            if not isinstance(path_item[method], dict):
+                issues.append(f"オペレーション定義はオブジェクトである必要があります: {label} {method.upper()} {path}")
+
+    return issues
+
+
+def load_gpt_config(config_path: str) -> Dict:
+    """
+    GPT設定JSONを読み込む
+
+    Raises:
+        OSError: ファイルを読み込めない場合
+        ValueError: JSONとして不正、またはトップレベルがオブジェクトでない場合
+    """
+    with open(config_path, "r", encoding="utf-8") as f:
+        gpt_config = json.load(f)
+    if not isinstance(gpt_config, dict):
+        raise ValueError("トップレベルはオブジェクトである必要があります")
+    return gpt_config
+
+
+def check_gpt_config(gpt_config: Dict, project_root: Optional[str] = None) -> List[str]:
+    """
+    デプロイ前のGPT設定検証（問題点の一覧を返す）
+
+    Args:
+        project_root: ナレッジファイルの相対パスの基準（省略時はカレントディレクトリ）
+    """
+    issues = validate_gpt_config(gpt_config)
+    if not isinstance(gpt_config, dict):
+        return issues
+
+    # ナレッジファイル存在確認
+    knowledge_files = gpt_config.get("knowledge_files", [])
+    if not isinstance(knowledge_files, list) or not all(isinstance(path, str) for path in knowledge_files):
+        issues.append("knowledge_files はファイルパスのリストである必要があります")
+        knowledge_files = []
+    for knowledge_file in knowledge_files:
+        if not _file_exists(os.path.join(project_root or ".", knowledge_file)):
+            issues.append(f"ナレッジファイルが見つかりません: {knowledge_file}")
+
+    # 機能設定確認
+    capabilities = gpt_config.get("capabilities", {})
+    if not isinstance(capabilities, dict):
+        issues.append("capabilities はオブジェクトである必要があります")
+    else:
+        for key, enabled in capabilities.items():
+            if key not in KNOWN_CAPABILITIES:
+                issues.append(f"未知の機能設定です: {key}")
+            elif not isinstance(enabled, bool):
+                issues.append(f"機能設定は true / false で指定してください: {key}")
+
+    # Action設定確認
+    actions = gpt_config.get("actions", [])
+    if not isinstance(actions, list):
+        issues.append("actions はリストである必要があります")
+        actions = []
+    seen = set()
+    for action in actions:
+        issues.extend(validate_action_schema(action))
+        name = action.get("name") if isinstance(action, dict) else None
+        if name in seen:
+            issues.append(f"Action名が重複しています: {name}")
+        elif name:
+            seen.add(name)
+
+    return issues
+
+
+def validate_file(config_path: str, project_root: Optional[str] = None) -> Dict:
+    """
+    1ファイルを検証して結果を返す（例外は結果に含める）
+
+    Args:
+        project_root: ナレッジファイルの相対パスの基準（省略時は設定を所有するプロジェクトのルート）
+    """
+    try:
+        gpt_config = load_gpt_config(config_path)
+        errors = check_gpt_config(gpt_config, project_root or config_project_root(config_path))
+        name = gpt_config.get("name")
+    except Exception as e:
+        errors = [f"読み込みエラー: {e}"]
+        name = None
+
+    return {"path": config_path, "name": name, "valid": not errors, "errors": errors}
+
+
+def expand_patterns(patterns: List[str]) -> List[str]:
+    """globパターンを展開（重複除去・ソート済み）"""
+    paths = set()
+    for pattern in patterns:
+        matches = glob.glob(pattern, recursive=True)
+        # globに一致しない通常のパスはそのまま扱い、読み込みエラーとして報告する
+        paths.update(matches if matches or glob.has_magic(pattern) else [pattern])
+    return sorted(paths)
+
+
+def validate_fleet(patterns: List[str], workers: Optional[int] = None,
+                   project_root: Optional[str] = None) -> Dict:
+    """
+    複数のGPT設定を並列に検証
+
+    Args:
+        patterns: gpt_config.json のglobパターン（** 対応）
+        workers: 並列プロセス数（省略時はCPU数）
+        project_root: ナレッジファイルの相対パスの基準（省略時は設定ごとに所有するプロジェクトのルート）
+
+    Returns:
+        {"summary": {...}, "results": [...]} 形式のレポート
+    """
+    started = time.perf_counter()
+    paths = expand_patterns(patterns)
+    workers = workers or os.cpu_count() or 1
+    validate = partial(validate_file, project_root=project_root)
+
+    if workers > 1 and len(paths) >= PARALLEL_THRESHOLD:
+        chunksize = max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(validate, paths, chunksize=chunksize))
+    else:
+        results = [validate(path) for path in paths]
+
+    failed = sum(1 for result in results if not result["valid"])
+    return {
+        "summary": {
+            "total": len(results),
+            "passed": len(results) - failed,
+            "failed": failed,
+            "elapsed_sec": round(time.perf_counter() - started, 3),
+        },
+        "results": results,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='GPT設定一括検証ツール')
+    parser.add_argument('patterns', nargs='+', help='gpt_config.json のglobパターン（** 対応）')
+    parser.add_argument('--workers', type=int, help='並列プロセス数（省略時はCPU数）')
+    parser.add_argument('--output', help='レポートの出力先（省略時は標準出力）')
+    parser.add_argument('--project-root', help='ナレッジファイルの相対パスの基準（省略時は設定ごとに所有するプロジェクトのルート）')
+
+    args = parser.parse_args(argv)
+
+    report = validate_fleet(args.patterns, args.workers, args.project_root)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+
+    summary = report["summary"]
+    print(f"検証完了: {summary['passed']}/{summary['total']} 件成功 ({summary['elapsed_sec']} 秒)", file=sys.stderr)
+    return 0 if summary["total"] and not summary["failed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
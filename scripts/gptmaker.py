@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+GPTMAKER コマンドラインツール
+
+ビルド・検証・ドライラン・デプロイを一つのCLIにまとめます。
+
+    python scripts/gptmaker.py build [--clean] [--env ENV] [--variants]
+    python scripts/gptmaker.py check-reproducible [--against build]
+    python scripts/gptmaker.py validate [build/gpt_config.json]
+    python scripts/gptmaker.py dry-run [test_gpt_config.json]
+    python scripts/gptmaker.py validate-fleet "gpts/**/gpt_config.json"
+    python scripts/gptmaker.py deploy --config build/gpt_config.json
+    python scripts/gptmaker.py rollback --name MyGPT --version 3
+    python scripts/gptmaker.py changes --base origin/main
+    python scripts/gptmaker.py lint
+
+pre-commitフック等から頻繁に呼ばれるため、起動を軽くすることを優先し、
+Selenium・YAML等の重い依存は各サブコマンドの中で必要になった時点で
+読み込みます。モジュールのトップレベルに重いimportを追加しないでください。
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from typing import Dict, List, Optional
+
+# サブコマンドは scripts.* で読み込む（scripts/ から直接実行された場合はリポジトリルートを追加）
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logger = logging.getLogger("gptmaker")
+
+
+def _load_gpt_config(config_path: str) -> Dict:
+    """GPT設定JSONを読み込む"""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def cmd_build(args) -> bool:
+    """プロンプトをビルド"""
+    from scripts.build_prompts import PromptBuilder
+
+    builder = PromptBuilder(args.project_root, environment=args.env)
+
+    if args.clean:
+        import shutil
+        if builder.build_dir.exists():
+            shutil.rmtree(builder.build_dir)
+            builder.build_dir.mkdir()
+
+    return builder.build_variants() if args.variants else builder.build()
+
+
+def cmd_check_reproducible(args) -> bool:
+    """同じ入力から2回ビルドし、出力がバイト単位で一致することを確認"""
+    import tempfile
+
+    from scripts.build_prompts import PromptBuilder, compare_builds
+
+    with tempfile.TemporaryDirectory(prefix="gptmaker-build-") as tmp_dir:
+        build_dirs = [os.path.join(tmp_dir, "a")]
+        if not args.against:
+            build_dirs.append(os.path.join(tmp_dir, "b"))
+
+        for build_dir in build_dirs:
+            if not PromptBuilder(args.project_root, environment=args.env, build_dir=build_dir).build():
+                return False
+
+        differences = compare_builds(build_dirs[0], args.against or build_dirs[1])
+
+    if differences:
+        logger.error("ビルドが再現しません:")
+        for difference in differences:
+            logger.error(f"  - {difference}")
+        return False
+
+    logger.info("ビルドはバイト単位で一致しました")
+    return True
+
+
+def cmd_validate(args) -> bool:
+    """ビルド済みGPT設定を検証"""
+    from scripts.fleet_validator import check_gpt_config, config_project_root, load_gpt_config
+
+    try:
+        issues = check_gpt_config(load_gpt_config(args.config), config_project_root(args.config))
+    except (OSError, ValueError) as e:
+        logger.error(f"設定ファイル読み込みエラー: {args.config} - {e}")
+        return False
+
+    if issues:
+        logger.error(f"検証エラー: {args.config}")
+        for issue in issues:
+            logger.error(f"  - {issue}")
+        return False
+
+    logger.info(f"検証完了: {args.config}")
+    return True
+
+
+def dry_run(config_path: str, project_root: Optional[str] = None) -> List[str]:
+    """
+    デプロイせずにGPT設定を検証（validate-fleet と同じ検証・エラー処理）
+
+    ナレッジファイルの相対パスは project_root（省略時は設定を所有するプロジェクトのルート）を
+    基準に解決します。
+
+    Returns:
+        問題点の一覧（空の場合は正常。読み込みエラーも問題点として返す）
+    """
+    from scripts.fleet_validator import validate_file
+
+    result = validate_file(config_path, project_root)
+    if not result["valid"]:
+        return result["errors"]
+
+    # 検証済みのため各項目の型は保証されている
+    config = _load_gpt_config(config_path)
+
+    logger.info(f"  GPT名: {config.get('name')}")
+    logger.info(f"  会話スターター数: {len(config.get('conversation_starters', []))}")
+    logger.info(f"  ナレッジファイル数: {len(config.get('knowledge_files', []))}")
+    logger.info(f"  Action数: {len(config.get('actions', []))}")
+
+    for action in config.get('actions', []):
+        paths = action.get('schema', {}).get('paths') or {}
+        logger.info(f"  Action設定: {action.get('name')} (エンドポイント数: {len(paths)})")
+
+    return []
+
+
+def cmd_dry_run(args) -> bool:
+    """ドライラン（デプロイせずに設定を検証）"""
+    issues = dry_run(args.config, args.project_root)
+    if issues:
+        logger.error(f"ドライランエラー: {args.config}")
+        for issue in issues:
+            logger.error(f"  - {issue}")
+        return False
+
+    logger.info(f"ドライラン完了 - 設定は正常です: {args.config}")
+    return True
+
+
+def cmd_validate_fleet(args) -> bool:
+    """複数のGPT設定を並列に検証してJSONレポートを出力"""
+    from scripts.fleet_validator import main as fleet_main
+
+    argv = list(args.patterns)
+    if args.workers:
+        argv += ['--workers', str(args.workers)]
+    if args.output:
+        argv += ['--output', args.output]
+    if args.project_root:
+        argv += ['--project-root', args.project_root]
+    return fleet_main(argv) == 0
+
+
+def _create_deployer(args):
+    """サブコマンドの引数からデプロイヤーを作成（設定エラーの場合はNone）"""
+    from scripts.config_loader import ConfigError
+    # バックエンド（Selenium等）はデプロイ時のみ読み込む
+    from scripts.deployer_base import create_deployer
+
+    try:
+        deployer = create_deployer(args.backend, args.deploy_config, environment=args.env)
+    except (ConfigError, ValueError) as e:
+        logger.error(f"設定エラー: {e}")
+        return None
+
+    if args.skip_backup_check and deployer.config.get('backup_before_update'):
+        # 成果物ストアに記録のない既存GPTを初めて更新する場合のみ使う
+        logger.warning("--skip-backup-check: backup_before_update を無効にして更新します（ロールバック不可）")
+        deployer.config['backup_before_update'] = False
+    return deployer
+
+
+def cmd_deploy(args) -> bool:
+    """GPTをデプロイ"""
+    if args.action == 'update' and not args.name:
+        logger.error("--name は update アクションで必須です")
+        return False
+
+    deployer = _create_deployer(args)
+    if deployer is None:
+        return False
+
+    if args.profile:
+        if not hasattr(deployer, 'enable_profiling'):
+            logger.error("--profile は selenium バックエンドでのみ使用できます")
+            return False
+        deployer.enable_profiling()
+
+    if args.action == 'create':
+        return deployer.deploy_gpt(args.config)
+    return deployer.update_gpt(args.name, args.config)
+
+
+def cmd_rollback(args) -> bool:
+    """成果物ストアの過去バージョンで既存GPTを更新"""
+    deployer = _create_deployer(args)
+    if deployer is None:
+        return False
+    return deployer.rollback_gpt(args.name, args.source or args.name, args.version)
+
+
+def cmd_artifacts(args) -> bool:
+    """成果物ストアのバージョン一覧を表示"""
+    from scripts.artifact_store import ArtifactStore
+    from scripts.config_loader import ConfigError, artifact_dir
+
+    try:
+        store = ArtifactStore(args.artifact_dir or artifact_dir(args.project_root, args.env))
+    except (ConfigError, ValueError) as e:
+        logger.error(f"設定エラー: {e}")
+        return False
+    names = [args.name] if args.name else sorted(store.index["gpts"])
+    for name in names:
+        print(name)
+        for version, digest in enumerate(store.versions(name), 1):
+            print(f"  v{version}  {digest}")
+
+    for name, digest in sorted(store.index["deployed"].items()):
+        print(f"deployed: {name} -> {digest}")
+    return True
+
+
+def cmd_profile_report(args) -> bool:
+    """デプロイのプロファイル結果からHTMLレポートを生成"""
+    from scripts.deploy_profiler import generate_report
+
+    logger.info(f"レポート生成完了: {generate_report(args.output_dir, args.top)}")
+    return True
+
+
+def cmd_changes(args) -> bool:
+    """git の差分を分類し、CIで必要なステージを出力"""
+    from scripts.change_classifier import main as changes_main
+
+    argv = ['--head', args.head]
+    if args.base:
+        argv += ['--base', args.base]
+    if args.files:
+        argv += ['--files', *args.files]
+    if args.env:
+        argv += ['--env', args.env]
+    if args.github_output:
+        argv.append('--github-output')
+    return changes_main(argv) == 0
+
+
+def cmd_lint(args) -> bool:
+    """YAML/JSONファイルを1プロセスでまとめて構文チェック"""
+    from scripts.change_classifier import find_data_files, lint_files
+
+    paths = args.paths or find_data_files()
+    errors = lint_files(paths)
+    for error in errors:
+        logger.error(f"構文エラー: {error}")
+
+    logger.info(f"構文チェック完了: {len(paths) - len(errors)}/{len(paths)} 件成功")
+    return not errors
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """引数パーサーを構築"""
+    parser = argparse.ArgumentParser(prog='gptmaker', description='GPTMAKER コマンドラインツール')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build', help='プロンプトをビルド')
+    build.add_argument('--project-root', default='.', help='プロジェクトルートディレクトリ')
+    build.add_argument('--clean', action='store_true', help='ビルド前にbuildディレクトリをクリア')
+    build.add_argument('--env', help='適用する環境名（省略時は環境変数 GPTMAKER_ENV）')
+    build.add_argument('--variants', action='store_true',
+                       help='variants の全組み合わせを build/variants/ にビルド（A/Bテスト用）')
+    build.set_defaults(func=cmd_build)
+
+    reproducible = subparsers.add_parser('check-reproducible', help='2回のビルド結果がバイト単位で一致するか確認')
+    reproducible.add_argument('--project-root', default='.', help='プロジェクトルートディレクトリ')
+    reproducible.add_argument('--env', help='適用する環境名（省略時は環境変数 GPTMAKER_ENV）')
+    reproducible.add_argument('--against', help='比較対象の既存ビルドディレクトリ（省略時は2回ビルドして比較）')
+    reproducible.set_defaults(func=cmd_check_reproducible)
+
+    validate = subparsers.add_parser('validate', help='ビルド済みGPT設定を検証')
+    validate.add_argument('config', nargs='?', default='build/gpt_config.json', help='GPT設定ファイルのパス')
+    validate.set_defaults(func=cmd_validate)
+
+    dry_run_parser = subparsers.add_parser('dry-run', help='デプロイせずに設定とナレッジ・Actionを検証')
+    dry_run_parser.add_argument('config', nargs='?', default='build/gpt_config.json', help='GPT設定ファイルのパス')
+    dry_run_parser.add_argument('--project-root', help='ナレッジファイルの相対パスの基準（省略時は設定を所有するプロジェクトのルート）')
+    dry_run_parser.set_defaults(func=cmd_dry_run)
+
+    fleet = subparsers.add_parser('validate-fleet', help='複数のGPT設定を並列に検証（JSONレポート）')
+    fleet.add_argument('patterns', nargs='+', help='gpt_config.json のglobパターン（** 対応）')
+    fleet.add_argument('--workers', type=int, help='並列プロセス数（省略時はCPU数）')
+    fleet.add_argument('--output', help='レポートの出力先（省略時は標準出力）')
+    fleet.add_argument('--project-root', help='ナレッジファイルの相対パスの基準（省略時は設定ごとに所有するプロジェクトのルート）')
+    fleet.set_defaults(func=cmd_validate_fleet)
+
+    deploy = subparsers.add_parser('deploy', help='GPTをデプロイ')
+    deploy.add_argument('--config', required=True, help='GPT設定ファイルのパス')
+    deploy.add_argument('--action', choices=['create', 'update'], default='create', help='実行アクション')
+    deploy.add_argument('--name', help='更新対象のGPT名（updateの場合必須）')
+    deploy.add_argument('--deploy-config', default='config/deploy_config.yaml', help='デプロイ設定ファイルのパス')
+    deploy.add_argument('--env', help='適用する環境名（省略時は環境変数 GPTMAKER_ENV）')
+    deploy.add_argument('--backend', choices=['selenium', 'api'], help='デプロイバックエンド（省略時は設定ファイルの backend）')
+    deploy.add_argument('--profile', action='store_true', help='WebDriverコマンドを計測し、遅いコマンドのDOMを保存')
+    deploy.add_argument('--skip-backup-check', action='store_true',
+                        help='backup_before_update を今回だけ無効にする（ストアに記録のないGPTの初回更新用）')
+    deploy.set_defaults(func=cmd_deploy)
+
+    rollback = subparsers.add_parser('rollback', help='保存済みバージョンで既存GPTを更新（再ビルドなし）')
+    rollback.add_argument('--name', required=True, help='更新対象（デプロイ先）のGPT名')
+    rollback.add_argument('--source', help='ビルド時のGPT名（省略時は --name と同じ）')
+    rollback.add_argument('--version', type=int, help='戻すバージョン（1以上、省略時は最新、-1 で1つ前）')
+    rollback.add_argument('--deploy-config', default='config/deploy_config.yaml', help='デプロイ設定ファイルのパス')
+    rollback.add_argument('--env', help='適用する環境名（省略時は環境変数 GPTMAKER_ENV）')
+    rollback.add_argument('--backend', choices=['selenium', 'api'], help='デプロイバックエンド（省略時は設定ファイルの backend）')
+    rollback.add_argument('--skip-backup-check', action='store_true',
+                          help='backup_before_update を今回だけ無効にする')
+    rollback.set_defaults(func=cmd_rollback)
+
+    artifacts = subparsers.add_parser('artifacts', help='成果物ストアのバージョン一覧を表示')
+    artifacts.add_argument('name', nargs='?', help='GPT名（省略時は全GPT）')
+    artifacts.add_argument('--artifact-dir', help='成果物ストアのディレクトリ（省略時はデプロイ設定の artifacts.dir）')
+    artifacts.add_argument('--project-root', default='.', help='プロジェクトルートディレクトリ')
+    artifacts.add_argument('--env', help='適用する環境名（省略時は環境変数 GPTMAKER_ENV）')
+    artifacts.set_defaults(func=cmd_artifacts)
+
+    profile_report = subparsers.add_parser('profile-report', help='デプロイのプロファイル結果からHTMLレポートを生成')
+    profile_report.add_argument('--output-dir', default='logs/profiles', help='計測結果のディレクトリ')
+    profile_report.add_argument('--top', type=int, default=50, help='表示する遅いコマンドの件数')
+    profile_report.set_defaults(func=cmd_profile_report)
+
+    changes = subparsers.add_parser('changes', help='git の差分を分類し、CIで必要なステージを判定')
+    changes.add_argument('--base', help='比較元のコミット（省略時・比較不能時は全ステージ）')
+    changes.add_argument('--head', default='HEAD', help='比較先のコミット')
+    changes.add_argument('--files', nargs='+', help='変更ファイルを直接指定')
+    changes.add_argument('--env', help='適用する環境名（省略時は環境変数 GPTMAKER_ENV）')
+    changes.add_argument('--github-output', action='store_true', help='$GITHUB_OUTPUT にステージの判定を書き出す')
+    changes.set_defaults(func=cmd_changes)
+
+    lint = subparsers.add_parser('lint', help='YAML/JSONファイルを1プロセスでまとめて構文チェック')
+    lint.add_argument('paths', nargs='*', help='対象ファイル（省略時はリポジトリ全体）')
+    lint.set_defaults(func=cmd_lint)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    return 0 if args.func(args) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
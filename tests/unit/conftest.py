@@ -0,0 +1,10 @@
+"""
+単体テスト共通設定
+
+scripts.* を読み込めるよう、リポジトリルートを sys.path に追加します。
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
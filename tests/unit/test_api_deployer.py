@@ -0,0 +1,204 @@
+"""APIDeployer の単体テスト（スタブAPIサーバーに対してデプロイ）"""
+
+import hashlib
+import json
+
+import pytest
+
+from scripts.api_deployer import APIDeployer
+from scripts.api_stub_server import StubAPIServer
+
+
+@pytest.fixture
+def server():
+    with StubAPIServer() as stub:
+        yield stub
+
+
+@pytest.fixture
+def deployer(tmp_path, server, monkeypatch):
+    """スタブサーバーに向けたデプロイヤー（成果物ストア・ログは tmp_path 配下）"""
+    monkeypatch.delenv("GPTMAKER_ENV", raising=False)
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    config_path = config_dir / "deploy_config.yaml"
+    config_path.write_text(
+        "backend: api\n"
+        "api:\n"
+        f"  base_url: {server.base_url}\n"
+        "automation:\n"
+        "  retry_count: 0\n"
+        "artifacts:\n"
+        "  dir: artifacts\n"
+        "logging:\n"
+        f"  file: {(tmp_path / 'logs' / 'deployment.log').as_posix()}\n",
+        encoding="utf-8",
+    )
+    return APIDeployer(str(config_path), build_config_path=None)
+
+
+def write_gpt_config(tmp_path, name="TestGPT", instructions="指示文", knowledge=None,
+                     actions=None, visibility="private", file_name="gpt_config.json"):
+    """GPT設定JSONとナレッジファイルを書き出してパスを返す"""
+    knowledge_files = []
+    for filename, content in (knowledge or {}).items():
+        path = tmp_path / "knowledge" / filename
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+        knowledge_files.append(str(path))
+
+    gpt_config = {
+        "name": name,
+        "description": "テスト用GPT",
+        "instructions": instructions,
+        "conversation_starters": ["こんにちは"],
+        "capabilities": {"web_browsing": False},
+        "knowledge_files": knowledge_files,
+        "actions": actions or [],
+        "visibility": visibility,
+    }
+    config_path = tmp_path / file_name
+    config_path.write_text(json.dumps(gpt_config, ensure_ascii=False), encoding="utf-8")
+    return str(config_path)
+
+
+def only_gpt(server):
+    assert len(server.gpts) == 1
+    return next(iter(server.gpts.values()))
+
+
+def test_deploy_creates_gpt(tmp_path, server, deployer):
+    actions = [{"name": "search", "schema": {"openapi": "3.1.0"}}]
+    config_path = write_gpt_config(tmp_path, knowledge={"a.md": "A", "b.md": "B"},
+                                   actions=actions, visibility="public")
+
+    assert deployer.deploy_gpt(config_path)
+
+    gpt = only_gpt(server)
+    assert gpt["name"] == "TestGPT"
+    assert gpt["instructions"] == "指示文"
+    assert gpt["conversation_starters"] == ["こんにちは"]
+    assert sorted(file["filename"] for file in gpt["files"]) == ["a.md", "b.md"]
+    assert gpt["actions"] == actions
+    assert gpt["visibility"] == "public"
+    assert deployer.artifact_store.deployed("TestGPT") == deployer.artifact_store.resolve("TestGPT")
+
+
+def test_deploy_without_knowledge_skips_upload(tmp_path, server, deployer):
+    assert deployer.deploy_gpt(write_gpt_config(tmp_path))
+
+    assert only_gpt(server)["files"] == []
+    assert not any(path.endswith("/files") for _, path in server.requests)
+
+
+def test_update_changes_settings(tmp_path, server, deployer):
+    assert deployer.deploy_gpt(write_gpt_config(tmp_path))
+
+    assert deployer.update_gpt("TestGPT", write_gpt_config(tmp_path, instructions="新しい指示文"))
+
+    assert only_gpt(server)["instructions"] == "新しい指示文"
+
+
+def test_update_unknown_gpt_fails(tmp_path, server, deployer):
+    assert not deployer.update_gpt("MissingGPT", write_gpt_config(tmp_path))
+    assert server.gpts == {}
+
+
+def test_update_keeps_unchanged_knowledge(tmp_path, server, deployer):
+    assert deployer.deploy_gpt(write_gpt_config(tmp_path, knowledge={"a.md": "A", "b.md": "B"}))
+    before = only_gpt(server)["files"]
+
+    assert deployer.update_gpt("TestGPT", write_gpt_config(tmp_path, knowledge={"a.md": "A", "b.md": "B"}))
+
+    assert only_gpt(server)["files"] == before
+    assert server.file_count == 2
+
+
+def test_update_replaces_changed_and_removed_knowledge(tmp_path, server, deployer):
+    assert deployer.deploy_gpt(write_gpt_config(tmp_path, knowledge={"a.md": "A", "b.md": "B"}))
+    files = {file["filename"]: file for file in only_gpt(server)["files"]}
+
+    (tmp_path / "knowledge" / "a.md").unlink()
+    assert deployer.update_gpt("TestGPT", write_gpt_config(tmp_path, knowledge={"b.md": "B", "c.md": "C"}))
+
+    updated = only_gpt(server)["files"]
+    assert sorted(file["filename"] for file in updated) == ["b.md", "c.md"]
+    assert files["b.md"] in updated
+    assert [request for request in server.requests if request[0] == "DELETE"] == [
+        ("DELETE", f"/gpts/g-1/files/{files['a.md']['id']}")]
+
+
+def test_rollback_restores_previous_knowledge(tmp_path, server, deployer):
+    assert deployer.deploy_gpt(write_gpt_config(tmp_path, knowledge={"a.md": "v1"}))
+    assert deployer.update_gpt("TestGPT", write_gpt_config(tmp_path, instructions="v2", knowledge={"a.md": "v2"}))
+
+    assert deployer.rollback_gpt("TestGPT", "TestGPT", version=1)
+
+    gpt = only_gpt(server)
+    assert gpt["instructions"] == "指示文"
+    assert [file["filename"] for file in gpt["files"]] == ["a.md"]
+    assert gpt["files"][0]["sha256"] == hashlib.sha256(b"v1").hexdigest()
+
+
+def test_update_without_actions_removes_actions(tmp_path, server, deployer):
+    actions = [{"name": "search", "schema": {"openapi": "3.1.0"}}]
+    assert deployer.deploy_gpt(write_gpt_config(tmp_path, actions=actions))
+
+    assert deployer.update_gpt("TestGPT", write_gpt_config(tmp_path, actions=[]))
+
+    assert only_gpt(server)["actions"] == []
+
+
+def test_rollback_restores_previous_actions(tmp_path, server, deployer):
+    assert deployer.deploy_gpt(write_gpt_config(tmp_path))
+    actions = [{"name": "search", "schema": {"openapi": "3.1.0"}}]
+    assert deployer.update_gpt("TestGPT", write_gpt_config(tmp_path, actions=actions))
+
+    assert deployer.rollback_gpt("TestGPT", "TestGPT", version=1)
+
+    assert only_gpt(server)["actions"] == []
+
+
+def test_relative_knowledge_resolved_against_project_root(tmp_path, server, deployer, monkeypatch):
+    (tmp_path / "src" / "knowledge").mkdir(parents=True)
+    (tmp_path / "src" / "knowledge" / "a.md").write_text("A", encoding="utf-8")
+    config_path = tmp_path / "build" / "gpt_config.json"
+    config_path.parent.mkdir()
+    config_path.write_text(json.dumps({
+        "name": "TestGPT", "instructions": "指示文", "knowledge_files": ["src/knowledge/a.md"],
+    }), encoding="utf-8")
+    elsewhere = tmp_path / "elsewhere"
+    elsewhere.mkdir()
+    monkeypatch.chdir(elsewhere)
+
+    assert deployer.deploy_gpt(str(config_path))
+
+    assert [file["filename"] for file in only_gpt(server)["files"]] == ["a.md"]
+    assert deployer.artifact_store.deployed("TestGPT") is not None
+
+    assert deployer.update_gpt("TestGPT", str(config_path))
+    assert server.file_count == 1
+
+
+def test_session_reuses_connection(tmp_path, server, deployer):
+    first = write_gpt_config(tmp_path, name="GPT-A", knowledge={"a.md": "A"}, file_name="a.json")
+    second = write_gpt_config(tmp_path, name="GPT-B", knowledge={"b.md": "B"}, file_name="b.json")
+
+    with deployer:
+        assert deployer.deploy_gpt(first)
+        assert deployer.deploy_gpt(second)
+        assert deployer.update_gpt("GPT-A", first)
+
+    assert len(server.gpts) == 2
+    assert len(server.requests) > 6
+    assert len(server.connections) == 1
+    assert deployer.session is None
+
+
+def test_session_closed_after_each_deploy_outside_with(tmp_path, server, deployer):
+    assert deployer.deploy_gpt(write_gpt_config(tmp_path, name="GPT-A", file_name="a.json"))
+    assert deployer.deploy_gpt(write_gpt_config(tmp_path, name="GPT-B", file_name="b.json"))
+
+    assert not deployer.connected
+    assert deployer.session is None
+    assert len(server.connections) == 2
@@ -0,0 +1,108 @@
+"""artifact_store の単体テスト"""
+
+import json
+
+import pytest
+
+from scripts.artifact_store import ArtifactError, ArtifactStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArtifactStore(tmp_path / "artifacts")
+
+
+def gpt_config(name="TestGPT", instructions="指示文", knowledge_files=()):
+    return {"name": name, "instructions": instructions, "knowledge_files": list(knowledge_files)}
+
+
+def object_count(store):
+    return sum(1 for path in store.objects_dir.rglob("*") if path.is_file())
+
+
+def test_same_build_is_stored_once(tmp_path, store):
+    (tmp_path / "a.md").write_text("A", encoding="utf-8")
+    config = gpt_config(knowledge_files=["a.md"])
+
+    first = store.put_build(config, tmp_path)
+    count = object_count(store)
+    second = store.put_build(config, tmp_path)
+
+    assert first == {"hash": first["hash"], "version": 1, "new": True}
+    assert second == {"hash": first["hash"], "version": 1, "new": False}
+    assert object_count(store) == count == 2
+    assert store.versions("TestGPT") == [first["hash"]]
+
+
+def test_changed_build_adds_version_and_shares_knowledge(tmp_path, store):
+    (tmp_path / "a.md").write_text("A", encoding="utf-8")
+
+    first = store.put_build(gpt_config(knowledge_files=["a.md"]), tmp_path)
+    second = store.put_build(gpt_config(instructions="新しい指示文", knowledge_files=["a.md"]), tmp_path)
+
+    assert second["version"] == 2
+    assert second["hash"] != first["hash"]
+    # ナレッジファイルは同一内容のため1回だけ保存される
+    assert object_count(store) == 3
+
+
+def test_index_is_persisted(tmp_path, store):
+    digest = store.put_build(gpt_config())["hash"]
+    store.record_deployment("TestGPT-Dev", digest)
+
+    reopened = ArtifactStore(store.root)
+
+    assert reopened.resolve("TestGPT") == digest
+    assert reopened.deployed("TestGPT-Dev") == digest
+
+
+def test_missing_knowledge_file_is_error(tmp_path, store):
+    with pytest.raises(ArtifactError, match="ナレッジファイルが見つかりません"):
+        store.put_build(gpt_config(knowledge_files=["missing.md"]), tmp_path)
+
+
+def test_resolve_versions(store):
+    hashes = [store.put_build(gpt_config(instructions=f"v{i}"))["hash"] for i in range(1, 4)]
+
+    assert store.resolve("TestGPT") == hashes[-1]
+    assert store.resolve("TestGPT", 1) == hashes[0]
+    assert store.resolve("TestGPT", 3) == hashes[2]
+    assert store.resolve("TestGPT", -1) == hashes[1]
+
+
+@pytest.mark.parametrize("version", [4, -3, 0])
+def test_resolve_out_of_range_is_error(store, version):
+    for i in range(1, 4):
+        store.put_build(gpt_config(instructions=f"v{i}"))
+
+    with pytest.raises(ArtifactError, match="バージョン"):
+        store.resolve("TestGPT", version)
+
+
+def test_resolve_unknown_gpt_is_error(store):
+    with pytest.raises(ArtifactError, match="登録されていません"):
+        store.resolve("MissingGPT")
+
+
+def test_checkout_restores_stored_knowledge(tmp_path, store):
+    knowledge = tmp_path / "docs" / "guide.md"
+    knowledge.parent.mkdir()
+    knowledge.write_text("v1", encoding="utf-8")
+    digest = store.put_build(gpt_config(knowledge_files=["docs/guide.md"]), tmp_path)["hash"]
+
+    # 保存後にファイルが変わっても保存時の内容で展開される
+    knowledge.write_text("v2", encoding="utf-8")
+    config_path = store.checkout(digest)
+
+    restored = json.loads(config_path.read_text(encoding="utf-8"))
+    assert restored["name"] == "TestGPT"
+    assert len(restored["knowledge_files"]) == 1
+    restored_file = restored["knowledge_files"][0]
+    assert restored_file.endswith("guide.md")
+    assert open(restored_file, encoding="utf-8").read() == "v1"
+    assert store.checkout(digest) == config_path
+
+
+def test_checkout_unknown_hash_is_error(store):
+    with pytest.raises(ArtifactError, match="成果物が見つかりません"):
+        store.checkout("0" * 64)
@@ -0,0 +1,205 @@
+"""build_prompts の単体テスト"""
+
+import json
+
+import pytest
+
+from scripts.build_prompts import BUILD_OUTPUTS, PromptBuilder, compare_builds
+from scripts.config_loader import ConfigError
+
+
+@pytest.fixture
+def builds(tmp_path):
+    """同じ内容の2つのビルドディレクトリ"""
+    dirs = tmp_path / "a", tmp_path / "b"
+    for build_dir in dirs:
+        build_dir.mkdir()
+        for name in BUILD_OUTPUTS:
+            (build_dir / name).write_bytes(f"{name}\n".encode("utf-8"))
+    return dirs
+
+
+def test_identical_builds(builds):
+    assert compare_builds(*builds) == []
+
+
+def test_content_difference(builds):
+    dir_a, dir_b = builds
+    (dir_b / "main_prompt.txt").write_bytes(b"changed\n")
+
+    assert compare_builds(dir_a, dir_b) == ["main_prompt.txt: 内容が一致しません"]
+
+
+def test_line_ending_difference(builds):
+    dir_a, dir_b = builds
+    (dir_b / "gpt_config.json").write_bytes(b"gpt_config.json\r\n")
+
+    assert compare_builds(dir_a, dir_b) == ["gpt_config.json: 内容が一致しません"]
+
+
+def test_missing_output(builds):
+    dir_a, dir_b = builds
+    (dir_a / "build_info.json").unlink()
+
+    assert compare_builds(dir_a, dir_b) == ["build_info.json: 片方のビルドに存在しません"]
+
+
+def test_other_files_are_ignored(builds):
+    dir_a, dir_b = builds
+    (dir_a / "notes.txt").write_text("a", encoding="utf-8")
+
+    assert compare_builds(dir_a, dir_b) == []
+
+
+def make_project(root, extra_config=""):
+    """ビルド可能な最小構成のプロジェクト"""
+    files = {
+        "src/prompts/role_definition.md": "あなたはテスト用のアシスタントです。" * 5,
+        "src/instructions/main_instructions.md": "質問に簡潔に答えてください。" * 5,
+        "src/examples/example_001.md": "例1",
+        "src/knowledge/faq.md": "よくある質問",
+        "config/build_config.yaml": (
+            "gpt_name: TestGPT\n"
+            "description: テスト用GPT\n"
+            "components:\n"
+            "  role_definition: src/prompts/role_definition.md\n"
+            "  instructions: src/instructions/main_instructions.md\n"
+            "  examples: src/examples/\n"
+            "  knowledge: src/knowledge/\n"
+            + extra_config
+        ),
+    }
+    for path, content in files.items():
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_text(content, encoding="utf-8")
+    return root
+
+
+ACTIONS_CONFIG = """\
+actions:
+  - name: search
+    schema:
+      openapi: 3.1.0
+      info: {title: Search, version: 1.0.0}
+      servers: [{url: "https://api.example.com"}]
+      paths:
+        /search:
+          get: {operationId: search}
+"""
+
+
+def test_build_outputs_actions(tmp_path):
+    make_project(tmp_path, ACTIONS_CONFIG)
+
+    assert PromptBuilder(str(tmp_path)).build()
+
+    gpt_config = json.loads((tmp_path / "build" / "gpt_config.json").read_text(encoding="utf-8"))
+    assert [action["name"] for action in gpt_config["actions"]] == ["search"]
+    assert gpt_config["actions"][0]["schema"]["paths"] == {"/search": {"get": {"operationId": "search"}}}
+
+
+def test_build_rejects_invalid_actions(tmp_path):
+    make_project(tmp_path, ACTIONS_CONFIG.replace("openapi: 3.1.0", "openapi: 2.0"))
+
+    assert not PromptBuilder(str(tmp_path)).build()
+
+
+def test_actions_change_changes_build(tmp_path):
+    make_project(tmp_path, ACTIONS_CONFIG)
+    assert PromptBuilder(str(tmp_path)).build()
+    before = (tmp_path / "build" / "gpt_config.json").read_bytes()
+
+    (tmp_path / "config" / "build_config.yaml").write_text(
+        (tmp_path / "config" / "build_config.yaml").read_text(encoding="utf-8").replace("/search", "/find"),
+        encoding="utf-8")
+    assert PromptBuilder(str(tmp_path)).build()
+
+    assert (tmp_path / "build" / "gpt_config.json").read_bytes() != before
+
+
+COMPONENTS = {
+    "role_definition": "src/prompts/role_definition.md",
+    "instructions": "src/instructions/main_instructions.md",
+    "examples": "src/examples/",
+}
+
+
+@pytest.fixture
+def builder(tmp_path):
+    return PromptBuilder(str(tmp_path))
+
+
+def test_variant_matrix_product_and_id_order(builder):
+    config = {
+        "components": COMPONENTS,
+        "variants": {
+            # 軸の順序は VARIANT_AXES、候補は名前順
+            "examples": {"none": [], "all": "src/examples/"},
+            "role_definition": {"standard": "a.md", "concise": "b.md"},
+        },
+    }
+
+    matrix = builder.variant_matrix(config)
+
+    assert [variant["id"] for variant in matrix] == [
+        "concise__all", "concise__none", "standard__all", "standard__none"]
+    assert matrix[1]["choices"] == {"role_definition": "concise", "examples": "none"}
+    assert matrix[1]["components"] == {
+        "role_definition": "b.md", "instructions": COMPONENTS["instructions"], "examples": []}
+
+
+@pytest.mark.parametrize("name", ["../x", "a/b", "..", "a__b", "_x", "-x", "", 1])
+def test_variant_matrix_rejects_bad_names(builder, name):
+    config = {"components": COMPONENTS, "variants": {"role_definition": {name: "a.md"}}}
+
+    with pytest.raises(ConfigError, match="バリアント名が不正です"):
+        builder.variant_matrix(config)
+
+
+@pytest.mark.parametrize("variants, message", [
+    ({}, "バリアントが定義されていません"),
+    ({"instructions": {"standard": ["a.md"]}}, "variants.instructions.standard はパス"),
+    ({"examples": {"some": ["a.md", 1]}}, "variants.examples.some はパスまたはパスのリスト"),
+])
+def test_variant_matrix_rejects_bad_definitions(builder, variants, message):
+    with pytest.raises(ConfigError, match=message):
+        builder.variant_matrix({"components": COMPONENTS, "variants": variants})
+
+
+VARIANTS_CONFIG = """\
+variants:
+  role_definition:
+    standard: src/prompts/role_definition.md
+    concise: src/prompts/concise.md
+  examples:
+    all: src/examples/
+    none: []
+"""
+
+
+def test_build_variants_manifest(tmp_path):
+    make_project(tmp_path, VARIANTS_CONFIG)
+    (tmp_path / "src" / "prompts" / "concise.md").write_text("簡潔に答えるアシスタントです。" * 5, encoding="utf-8")
+
+    assert PromptBuilder(str(tmp_path)).build_variants()
+
+    variants_dir = tmp_path / "build" / "variants"
+    manifest = json.loads((variants_dir / "manifest.json").read_text(encoding="utf-8"))
+    ids = [variant["id"] for variant in manifest["variants"]]
+    assert ids == ["concise__all", "concise__none", "standard__all", "standard__none"]
+    assert manifest["knowledge_files_count"] == 1
+    for variant_id in ids:
+        assert (variants_dir / variant_id / "gpt_config.json").exists()
+        assert (variants_dir / variant_id / "main_prompt.txt").exists()
+
+    fingerprints = {variant["id"]: variant["fingerprint"] for variant in manifest["variants"]}
+    assert len(set(fingerprints.values())) == 4
+
+    # 同じ構成の通常ビルドと同じ指紋になり、再ビルドしても変わらない
+    assert PromptBuilder(str(tmp_path)).build()
+    build_info = json.loads((tmp_path / "build" / "build_info.json").read_text(encoding="utf-8"))
+    assert build_info["fingerprint"] == fingerprints["standard__all"]
+
+    assert PromptBuilder(str(tmp_path)).build_variants()
+    rebuilt = json.loads((variants_dir / "manifest.json").read_text(encoding="utf-8"))
+    assert rebuilt == manifest
@@ -0,0 +1,81 @@
+"""change_classifier の単体テスト"""
+
+import pytest
+
+from scripts.change_classifier import GPT_STAGES, STAGES, classify_changes
+
+
+def test_unknown_diff_runs_all_stages():
+    assert classify_changes(None) == {"classification": "code", "categories": {}, "stages": list(STAGES)}
+
+
+def test_no_changes():
+    assert classify_changes([]) == {"classification": "none", "categories": {}, "stages": []}
+
+
+@pytest.mark.parametrize("path, classification", [
+    ("src/prompts/role_definition.md", "prompt"),
+    ("src/instructions/main_instructions.md", "prompt"),
+    ("src/examples/example_001.md", "prompt"),
+    ("src/knowledge/faq.txt", "knowledge"),
+])
+def test_gpt_content_changes_skip_tests(path, classification):
+    result = classify_changes([path])
+
+    assert result["classification"] == classification
+    assert result["stages"] == list(GPT_STAGES)
+
+
+def test_docs_only_changes():
+    result = classify_changes(["README.md", "docs/OPERATION_GUIDE.md"])
+
+    assert result["classification"] == "docs"
+    assert result["stages"] == []
+
+
+def test_deploy_config_changes():
+    result = classify_changes(["config/deploy_config.yaml"])
+
+    assert result["classification"] == "config"
+    assert result["stages"] == ["lint", "build", "deploy"]
+
+
+def test_build_config_actions_only():
+    result = classify_changes(["config/build_config.yaml"], {"actions"})
+
+    assert result["classification"] == "action"
+    assert result["stages"] == ["lint", "build", "validate", "deploy"]
+
+
+def test_build_config_comment_only():
+    result = classify_changes(["config/build_config.yaml"], set())
+
+    assert result["classification"] == "docs"
+    assert result["stages"] == ["lint"]
+
+
+@pytest.mark.parametrize("keys", [None, {"gpt_name"}, {"actions", "gpt_name"}])
+def test_build_config_other_changes(keys):
+    result = classify_changes(["config/build_config.yaml"], keys)
+
+    assert result["classification"] == "config"
+    assert result["stages"] == ["lint", "build", "validate", "deploy"]
+
+
+def test_code_changes_run_all_stages():
+    result = classify_changes(["src/prompts/role_definition.md", "scripts/build_prompts.py", "README.md"])
+
+    assert result["classification"] == "code"
+    assert result["stages"] == list(STAGES)
+    assert result["categories"] == {
+        "prompt": ["src/prompts/role_definition.md"],
+        "code": ["scripts/build_prompts.py"],
+        "docs": ["README.md"],
+    }
+
+
+def test_mixed_gpt_changes():
+    result = classify_changes(["src/prompts/role_definition.md", "src/knowledge/faq.txt", "docs/notes.md"])
+
+    assert result["classification"] == "mixed"
+    assert result["stages"] == list(GPT_STAGES)
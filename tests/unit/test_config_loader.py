@@ -0,0 +1,165 @@
+"""config_loader の単体テスト"""
+
+import pytest
+
+from scripts import config_loader
+from scripts.config_loader import (DEPLOY_SCHEMA, ConfigError, build_deploy_overrides,
+                                   expand_env, load_config, validate_schema)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(monkeypatch):
+    monkeypatch.delenv("GPTMAKER_ENV", raising=False)
+    config_loader.clear_cache()
+    yield
+    config_loader.clear_cache()
+
+
+def write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+BASE = """\
+browser:
+  headless: true
+  wait_timeout: 30
+automation:
+  retry_count: 3
+environments:
+  production:
+    gpt_name_suffix: ""
+    backup_before_update: true
+    browser:
+      wait_timeout: 60
+  development:
+    gpt_name_suffix: "-Dev"
+"""
+
+
+def test_layers_in_priority_order(tmp_path):
+    config_path = write(tmp_path / "deploy_config.yaml", BASE)
+    write(tmp_path / "deploy_config.local.yaml", "browser:\n  headless: false\n")
+
+    config = load_config(config_path, "production",
+                         overrides={"browser": {"wait_timeout": 45}, "automation": {"retry_count": 1}})
+
+    assert config["browser"] == {"headless": False, "wait_timeout": 60}
+    assert config["automation"] == {"retry_count": 1}
+    assert config["backup_before_update"] is True
+    assert config["environment"] == "production"
+    assert "environments" not in config
+
+
+def test_environment_from_variable(tmp_path, monkeypatch):
+    config_path = write(tmp_path / "deploy_config.yaml", BASE)
+    monkeypatch.setenv("GPTMAKER_ENV", "development")
+
+    assert load_config(config_path)["gpt_name_suffix"] == "-Dev"
+
+
+def test_local_file_can_add_environments(tmp_path):
+    config_path = write(tmp_path / "deploy_config.yaml", BASE)
+    write(tmp_path / "deploy_config.local.yaml", "environments:\n  staging:\n    gpt_name_suffix: -Stg\n")
+
+    assert load_config(config_path, "staging")["gpt_name_suffix"] == "-Stg"
+
+
+def test_unknown_environment_is_error(tmp_path):
+    config_path = write(tmp_path / "deploy_config.yaml", BASE)
+
+    with pytest.raises(ConfigError, match="未定義の環境"):
+        load_config(config_path, "qa")
+
+
+def test_missing_file_is_error(tmp_path):
+    with pytest.raises(ConfigError, match="見つかりません"):
+        load_config(tmp_path / "missing.yaml")
+
+
+def test_schema_errors(tmp_path):
+    config_path = write(tmp_path / "deploy_config.yaml",
+                        "browser:\n  wait_timeout: true\nunknown: 1\n")
+
+    with pytest.raises(ConfigError) as excinfo:
+        load_config(config_path, schema=DEPLOY_SCHEMA)
+
+    assert "browser.wait_timeout は int" in str(excinfo.value)
+    assert "未知の設定キー: unknown" in str(excinfo.value)
+
+
+def test_validate_schema_accepts_any_of_tuple_types():
+    assert validate_schema({"profiling": {"percentile": 90.5}}, DEPLOY_SCHEMA) == []
+    assert validate_schema({"profiling": {"percentile": 90}}, DEPLOY_SCHEMA) == []
+    assert validate_schema({"profiling": {"percentile": True}}, DEPLOY_SCHEMA) != []
+
+
+def test_expand_env():
+    environ = {"EMAIL": "user@example.com", "EMPTY": ""}
+    value = {
+        "email": "${EMAIL}",
+        "path": "${DRIVER:-chromedriver}",
+        "empty": "${EMPTY:-default}",
+        "missing": "${MISSING}",
+        "list": ["a-${EMAIL}", 3],
+    }
+
+    assert expand_env(value, environ) == {
+        "email": "user@example.com",
+        "path": "chromedriver",
+        "empty": "",
+        "missing": "",
+        "list": ["a-user@example.com", 3],
+    }
+
+
+def test_expand_env_in_loaded_config(tmp_path, monkeypatch):
+    config_path = write(tmp_path / "deploy_config.yaml",
+                        "browser:\n  chrome_driver_path: ${CHROME_DRIVER_PATH:-chromedriver}\n")
+
+    monkeypatch.delenv("CHROME_DRIVER_PATH", raising=False)
+    assert load_config(config_path)["browser"]["chrome_driver_path"] == "chromedriver"
+
+    monkeypatch.setenv("CHROME_DRIVER_PATH", "/opt/chromedriver")
+    assert load_config(config_path)["browser"]["chrome_driver_path"] == "/opt/chromedriver"
+
+
+def test_cache_reuses_parsed_config(tmp_path, monkeypatch):
+    config_path = write(tmp_path / "deploy_config.yaml", BASE)
+    calls = []
+    original = config_loader._parse_yaml
+    monkeypatch.setattr(config_loader, "_parse_yaml", lambda *args: calls.append(args) or original(*args))
+
+    first = load_config(config_path, "production")
+    first["browser"]["headless"] = False
+    second = load_config(config_path, "production")
+
+    assert len(calls) == 1
+    assert second["browser"]["headless"] is True
+
+
+def test_cache_key_covers_inputs(tmp_path):
+    config_path = write(tmp_path / "deploy_config.yaml", BASE)
+
+    assert load_config(config_path, "production")["gpt_name_suffix"] == ""
+    assert load_config(config_path, "development")["gpt_name_suffix"] == "-Dev"
+    assert load_config(config_path, "production",
+                       overrides={"automation": {"retry_count": 7}})["automation"]["retry_count"] == 7
+
+    write(tmp_path / "deploy_config.local.yaml", "automation:\n  retry_count: 9\n")
+    assert load_config(config_path, "production")["automation"]["retry_count"] == 9
+
+    write(config_path, BASE.replace("retry_count: 3", "retry_count: 5"))
+    (tmp_path / "deploy_config.local.yaml").unlink()
+    assert load_config(config_path, "production")["automation"]["retry_count"] == 5
+
+    assert len(config_loader._CONFIG_CACHE) == 5
+
+
+def test_build_deploy_overrides():
+    build_config = {"deploy_config": {"headless": False, "retry_count": 2}}
+
+    assert build_deploy_overrides(build_config) == {
+        "browser": {"headless": False},
+        "automation": {"retry_count": 2},
+    }
@@ -0,0 +1,126 @@
+"""deploy_profiler の単体テスト"""
+
+import json
+import time
+
+import pytest
+
+from scripts.deploy_profiler import DeployProfiler, generate_report, load_records, percentile, profiled_step
+
+
+class FakeDriver:
+    """execute の所要時間をコマンド名で切り替えられるWebDriverの代わり"""
+
+    page_source = "<html>slow</html>"
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+
+    def execute(self, driver_command, params=None):
+        time.sleep(self.delays.get(driver_command, 0))
+        return {"value": None}
+
+
+class FakeDeployer:
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    @profiled_step
+    def update(self):
+        time.sleep(0.02)
+        return self.create_custom_gpt()
+
+    @profiled_step
+    def create_custom_gpt(self):
+        time.sleep(0.05)
+        return True
+
+
+@pytest.mark.parametrize("values, percent, expected", [
+    ([], 95, 0.0),
+    ([10], 95, 10),
+    ([1, 2, 3, 4, 5], 50, 3),
+    ([1, 2, 3, 4, 5], 100, 5),
+    ([5, 1, 4, 2, 3], 0, 1),
+    ([0, 10], 25, 2.5),
+])
+def test_percentile(values, percent, expected):
+    assert percentile(values, percent) == pytest.approx(expected)
+
+
+def test_nested_steps_are_recorded_by_path_with_self_time(tmp_path):
+    profiler = DeployProfiler(tmp_path)
+
+    assert FakeDeployer(profiler).update()
+
+    records = {record["step"]: record for record in profiler.records}
+    assert set(records) == {"update", "update/create_custom_gpt"}
+    inner, outer = records["update/create_custom_gpt"], records["update"]
+    assert inner["self_ms"] == inner["duration_ms"]
+    assert outer["self_ms"] == pytest.approx(outer["duration_ms"] - inner["duration_ms"], abs=0.2)
+    assert outer["self_ms"] < inner["self_ms"]
+
+
+def test_commands_record_current_step_path(tmp_path):
+    profiler = DeployProfiler(tmp_path)
+    driver = profiler.attach(FakeDriver())
+
+    with profiler.step("update"):
+        with profiler.step("publish"):
+            driver.execute("clickElement")
+    driver.execute("quit")
+
+    commands = [record for record in profiler.records if record["kind"] == "command"]
+    assert [(record["command"], record["step"]) for record in commands] == [
+        ("clickElement", "update/publish"), ("quit", "-")]
+
+
+def test_snapshot_only_for_slow_commands(tmp_path):
+    profiler = DeployProfiler(tmp_path, default_threshold_ms=30, min_threshold_ms=0)
+    driver = profiler.attach(FakeDriver({"findElement": 0.06}))
+
+    driver.execute("clickElement")
+    driver.execute("findElement")
+
+    fast, slow = profiler.records
+    assert not fast["slow"] and "snapshot" not in fast
+    assert slow["slow"]
+    assert (tmp_path / slow["snapshot"]).read_text(encoding="utf-8") == FakeDriver.page_source
+    assert len(list((tmp_path / "snapshots").iterdir())) == 1
+
+
+def test_threshold_has_floor(tmp_path):
+    profiler = DeployProfiler(tmp_path, default_threshold_ms=0, min_threshold_ms=500)
+    driver = profiler.attach(FakeDriver())
+
+    driver.execute("clickElement")
+
+    assert not profiler.records[0]["slow"]
+    assert not (tmp_path / "snapshots").exists()
+
+
+def test_thresholds_from_history(tmp_path):
+    history = [{"run_id": "r", "kind": "command", "step": "-", "command": "click", "duration_ms": ms}
+               for ms in range(1, 101)]
+    history.append({"run_id": "r", "kind": "command", "step": "-", "command": "rare", "duration_ms": 1})
+    (tmp_path / "profile.jsonl").write_text(
+        "".join(json.dumps(record) + "\n" for record in history), encoding="utf-8")
+
+    profiler = DeployProfiler(tmp_path, percentile=90, min_samples=20,
+                              default_threshold_ms=2000, min_threshold_ms=0)
+
+    assert profiler.threshold_for("click") == pytest.approx(90.1)
+    assert profiler.threshold_for("rare") == 2000
+
+
+def test_flush_and_report_use_self_time(tmp_path):
+    profiler = DeployProfiler(tmp_path)
+    FakeDeployer(profiler).update()
+    profiler.flush()
+
+    assert profiler.records == []
+    assert len(load_records(tmp_path / "profile.jsonl")) == 2
+
+    report = generate_report(tmp_path).read_text(encoding="utf-8")
+    assert "<th>自己時間(秒)</th>" in report
+    assert "<td>update/create_custom_gpt</td>" in report
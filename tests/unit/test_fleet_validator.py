@@ -0,0 +1,150 @@
+"""fleet_validator の単体テスト"""
+
+import json
+
+import pytest
+
+from scripts.fleet_validator import check_gpt_config, validate_action_schema, validate_fleet, validate_file
+from scripts.gptmaker import dry_run
+
+
+def valid_gpt_config(name="TestGPT", **overrides):
+    gpt_config = {
+        "name": name,
+        "instructions": "指示文" * 50,
+        "conversation_starters": ["こんにちは"],
+        "capabilities": {"web_browsing": True},
+        "knowledge_files": [],
+        "actions": [],
+    }
+    gpt_config.update(overrides)
+    return gpt_config
+
+
+def write_json(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def make_project(root, name, build_path="build/gpt_config.json"):
+    """ビルド済みのプロジェクト（ナレッジはプロジェクトルートからの相対パス）"""
+    (root / "config").mkdir(parents=True)
+    (root / "config" / "build_config.yaml").write_text(f"gpt_name: {name}\n", encoding="utf-8")
+    (root / "src" / "knowledge").mkdir(parents=True)
+    (root / "src" / "knowledge" / "test.md").write_text("ナレッジ", encoding="utf-8")
+    return write_json(root / build_path, valid_gpt_config(name, knowledge_files=["src/knowledge/test.md"]))
+
+
+def test_knowledge_resolved_against_each_project(tmp_path, monkeypatch):
+    make_project(tmp_path / "p1", "GPT-1")
+    make_project(tmp_path / "p2", "GPT-2", "build/variants/standard/gpt_config.json")
+    monkeypatch.chdir(tmp_path)
+
+    report = validate_fleet(["*/build/**/gpt_config.json"], workers=1)
+
+    assert [result["errors"] for result in report["results"]] == [[], []]
+    assert report["summary"]["passed"] == 2
+
+
+def test_project_root_override(tmp_path, monkeypatch):
+    make_project(tmp_path / "p1", "GPT-1")
+    monkeypatch.chdir(tmp_path)
+
+    report = validate_fleet(["p1/build/gpt_config.json"], workers=1, project_root=str(tmp_path))
+
+    assert report["results"][0]["errors"] == ["ナレッジファイルが見つかりません: src/knowledge/test.md"]
+
+
+def test_config_outside_project_uses_cwd(tmp_path, monkeypatch):
+    (tmp_path / "knowledge.md").write_text("ナレッジ", encoding="utf-8")
+    write_json(tmp_path / "gpts" / "gpt_config.json", valid_gpt_config(knowledge_files=["knowledge.md"]))
+    monkeypatch.chdir(tmp_path)
+
+    assert validate_fleet(["gpts/*.json"], workers=1)["summary"]["passed"] == 1
+
+
+def valid_action(name="search"):
+    return {
+        "name": name,
+        "schema": {
+            "openapi": "3.1.0",
+            "info": {"title": "Search", "version": "1.0.0"},
+            "servers": [{"url": "https://api.example.com"}],
+            "paths": {"/search": {"get": {"operationId": "search"}}},
+        },
+    }
+
+
+def test_valid_action():
+    assert validate_action_schema(valid_action()) == []
+
+
+@pytest.mark.parametrize("action, issue", [
+    ("search", "Action定義はオブジェクトである必要があります"),
+    (dict(valid_action(), name=""), "Action名が設定されていません"),
+    ({"name": "search"}, "Actionのスキーマがありません: search"),
+    (dict(valid_action(), schema=dict(valid_action()["schema"], openapi="2.0")),
+     "openapi バージョンが 3.x ではありません: search"),
+    (dict(valid_action(), schema=dict(valid_action()["schema"], info={"title": "Search"})),
+     "info.title / info.version が必要です: search"),
+    (dict(valid_action(), schema=dict(valid_action()["schema"], servers=[{}])),
+     "servers にURLが必要です: search"),
+    (dict(valid_action(), schema=dict(valid_action()["schema"], paths={})),
+     "Actionにエンドポイントがありません: search"),
+    (dict(valid_action(), schema=dict(valid_action()["schema"], paths={"search": {"get": {}}})),
+     "パスは / で始まる必要があります: search search"),
+    (dict(valid_action(), schema=dict(valid_action()["schema"], paths={"/search": {"summary": "x"}})),
+     "パスにHTTPメソッドが定義されていません: search /search"),
+    (dict(valid_action(), schema=dict(valid_action()["schema"], paths={"/search": {"get": "x"}})),
+     "オペレーション定義はオブジェクトである必要があります: search GET /search"),
+])
+def test_invalid_action(action, issue):
+    assert validate_action_schema(action) == [issue]
+
+
+def test_duplicate_action_names():
+    gpt_config = valid_gpt_config(actions=[valid_action(), valid_action(), valid_action("other")])
+
+    assert check_gpt_config(gpt_config) == ["Action名が重複しています: search"]
+
+
+@pytest.mark.parametrize("gpt_config, issue", [
+    (valid_gpt_config(knowledge_files="a.md"), "knowledge_files はファイルパスのリストである必要があります"),
+    (valid_gpt_config(knowledge_files=[1]), "knowledge_files はファイルパスのリストである必要があります"),
+    (valid_gpt_config(capabilities=[]), "capabilities はオブジェクトである必要があります"),
+    (valid_gpt_config(capabilities={"voice": True}), "未知の機能設定です: voice"),
+    (valid_gpt_config(capabilities={"dalle": "yes"}), "機能設定は true / false で指定してください: dalle"),
+    (valid_gpt_config(actions={}), "actions はリストである必要があります"),
+    (valid_gpt_config(name=["GPT"]), "GPT名は文字列である必要があります"),
+    (valid_gpt_config(conversation_starters="こんにちは"), "会話スターターはリストである必要があります"),
+])
+def test_malformed_fields_are_issues(gpt_config, issue):
+    assert check_gpt_config(gpt_config) == [issue]
+
+
+@pytest.mark.parametrize("content, error", [
+    ("[]", "読み込みエラー: トップレベルはオブジェクトである必要があります"),
+    ("{", "読み込みエラー: "),
+])
+def test_unreadable_configs_are_reported(tmp_path, content, error):
+    path = tmp_path / "gpt_config.json"
+    path.write_text(content, encoding="utf-8")
+
+    result = validate_file(str(path))
+
+    assert not result["valid"]
+    assert result["errors"][0].startswith(error)
+
+
+def test_missing_file_is_reported(tmp_path):
+    report = validate_fleet([str(tmp_path / "missing.json")], workers=1)
+
+    assert report["summary"]["failed"] == 1
+    assert report["results"][0]["errors"][0].startswith("読み込みエラー: ")
+
+
+def test_dry_run_reports_malformed_config(tmp_path):
+    path = write_json(tmp_path / "gpt_config.json", valid_gpt_config(actions=[{"name": "search", "schema": []}]))
+
+    assert dry_run(str(path)) == ["Actionのスキーマがありません: search"]